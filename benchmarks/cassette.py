@@ -0,0 +1,60 @@
+"""
+Cost of replaying a few calls from a large cassette, which is memory-mapped and read lazily, compared to the cost of
+reading all of its records.
+
+Run from the root of the repository:
+
+    python -m benchmarks.cassette
+"""
+
+import os
+import tempfile
+from contextlib import suppress
+from time import perf_counter
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import cassette  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise.exceptions import ExpectationError  # noqa: E402
+from expectise.lib.cassette import CassetteReader  # noqa: E402
+
+RECORDS = 200_000
+PAYLOAD = 2_048  # bytes per recorded result
+CONSUMED = 10
+
+
+@mock_if(ENV_KEY, "test")
+def fetch(key):
+    return {"key": key, "body": os.urandom(PAYLOAD)}
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "fetch.cassette")
+        start = perf_counter()
+        with cassette(path, fetch, record=True):
+            for i in range(RECORDS):
+                fetch(i)
+        tear_down()
+        size = os.path.getsize(path)
+        print(f"record {RECORDS} calls: {perf_counter() - start:8.3f} s, {size / 2**20:.0f} MiB")
+
+        start = perf_counter()
+        with cassette(path, fetch):
+            for i in range(CONSUMED):
+                fetch(i)
+        elapsed = perf_counter() - start
+        with suppress(ExpectationError):
+            tear_down()  # most recorded calls are not replayed on purpose
+        print(f"replay {CONSUMED} calls: {elapsed * 1e3:8.3f} ms")
+
+        start = perf_counter()
+        list(CassetteReader(path).track(fetch._original_id))
+        print(f"read all {RECORDS} records: {perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of `Expect(...)` statements construction, which resolves the marker of the mocked function or method.
+
+Run from the root of the repository:
+
+    python -m benchmarks.expect
+"""
+
+import os
+from contextlib import suppress
+from timeit import repeat
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise.exceptions import ExpectationError  # noqa: E402
+
+STATEMENTS = 10_000
+REPEAT = 5
+
+
+class Client:
+    @mock_if(ENV_KEY, "test")
+    def get(self, key):
+        return key
+
+    @mock_if(ENV_KEY, "test")
+    @classmethod
+    def create(cls, key):
+        return key
+
+    @mock_if(ENV_KEY, "test")
+    @property
+    def name(self):
+        return "client"
+
+
+@mock_if(ENV_KEY, "test")
+def decorated_function(key):
+    return key
+
+
+def temporarily_mocked_function(key):
+    return key
+
+
+def reset() -> None:
+    """Tear down the session, ignoring the expected calls that were never performed."""
+    with suppress(ExpectationError):
+        tear_down()
+    mock(temporarily_mocked_function)
+
+
+def per_statement_ns(ref) -> float:
+    """Best time per `Expect` statement over several runs, in nanoseconds."""
+    return min(repeat(lambda: Expect(ref), setup=reset, number=STATEMENTS, repeat=REPEAT)) / STATEMENTS * 1e9
+
+
+def main() -> None:
+    reset()
+    scenarios = [
+        ("method", Client.get),
+        ("classmethod", Client.create),
+        ("property", Client.name),
+        ("mock_if function", decorated_function),
+        ("mock function", temporarily_mocked_function),
+    ]
+    for name, ref in scenarios:
+        print(f"{name:<20} {per_statement_ns(ref):8.1f} ns/statement")
+    reset()
+
+
+if __name__ == "__main__":
+    main()
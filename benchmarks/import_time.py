@@ -0,0 +1,93 @@
+"""
+Cost of importing Expectise in a production environment, where only `mock_if` is used and the mocking machinery must
+not be loaded, compared to importing all of it as tests do.
+
+Also cost of importing a module with thousands of methods decorated with `mock_if`, in a test environment: markers are
+only registered when first needed, so importing such a module only pays for the decorators.
+
+Run from the root of the repository, without the test environment variable set:
+
+    python -m benchmarks.import_time
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+RUNS = 20
+# Modules that production code must not pay for, directly or through the standard library
+HEAVY_MODULES = ["expectise.lib.session", "expectise.lib.mock", "expectise.models.lifespan", "enum", "typing"]
+CLASSES = 50
+METHODS = 100  # per class
+
+
+def import_time_us(statement: str) -> int:
+    """Best cumulative time spent in the imports of the statement over several fresh interpreters, in microseconds."""
+    env = {key: value for key, value in os.environ.items() if key != "ENV"}
+    timings = []
+    for _ in range(RUNS):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement], env=env, capture_output=True, text=True, check=True
+        )
+        # lines read `import time: <self> | <cumulative> | <module>`, nested modules being indented and listed first:
+        # only top-level modules imported after the interpreter startup (ending with `site`) are counted
+        lines = process.stderr.splitlines()
+        names = [line.split("|")[-1] for line in lines]
+        start = next(i for i, name in enumerate(names) if name.strip() == "site") + 1
+        timings.append(
+            sum(int(line.split("|")[1]) for line, name in zip(lines[start:], names[start:]) if name[1] != " ")
+        )
+    return min(timings)
+
+
+def imported_modules(statement: str) -> set[str]:
+    """Modules imported by the statement in a fresh interpreter."""
+    env = {key: value for key, value in os.environ.items() if key != "ENV"}
+    code = f"import sys; before = set(sys.modules); {statement}; print(*set(sys.modules) - before)"
+    process = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return set(process.stdout.split())
+
+
+def decorated_module_import_ms(directory: str, env_val: str | None) -> float:
+    """Best time spent importing a module with `CLASSES * METHODS` decorated methods, in milliseconds."""
+    path = os.path.join(directory, "decorated.py")
+    if not os.path.exists(path):
+        with open(path, "w") as f:
+            f.write("from expectise import mock_if\n")
+            for i in range(CLASSES):
+                f.write(f"\n\nclass API{i}:\n")
+                for j in range(METHODS):
+                    f.write(f'    @mock_if("ENV", "test")\n    def method_{j}(self, a, b):\n        return a + b\n\n')
+    env = {key: value for key, value in os.environ.items() if key != "ENV"}
+    env["PYTHONPATH"] = os.pathsep.join([directory, os.getcwd()])
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # only the first import compiles the module
+    if env_val is not None:
+        env["ENV"] = env_val
+    code = (
+        "import expectise, time; start = time.perf_counter(); import decorated; "
+        "print((time.perf_counter() - start) * 1e3)"
+    )
+    timings = []
+    for _ in range(RUNS):
+        process = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        timings.append(float(process.stdout))
+    return min(timings)
+
+
+def main() -> None:
+    production = "from expectise import mock_if"
+    loaded = imported_modules(production) & set(HEAVY_MODULES)
+    assert not loaded, f"`{production}` imports {', '.join(sorted(loaded))}."
+
+    for statement in [production, "from expectise import Expect, mock, cassette"]:
+        print(f"{statement:<48} {import_time_us(statement) / 1e3:8.2f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for env_val in [None, "test"]:
+            label = f"import {CLASSES * METHODS} decorated methods, ENV={env_val or ''}"
+            print(f"{label:<48} {decorated_module_import_ms(directory, env_val):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
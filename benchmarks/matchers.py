@@ -0,0 +1,62 @@
+"""
+Cost of the argument check of a mocked function called with a large payload, comparing the payload as a whole with
+checking two of its entries through a matcher.
+
+Run from the root of the repository:
+
+    python -m benchmarks.matchers
+"""
+
+import os
+from timeit import repeat
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import has_entries  # noqa: E402
+from expectise import instance_of  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+
+CALLS = 100
+REPEAT = 5
+
+
+@mock_if(ENV_KEY, "test")
+def send(payload):
+    return True
+
+
+def payload() -> dict:
+    """Request body of a few megabytes, built anew for each call as it would be by the code under test."""
+    return {"id": 42, "kind": "order", "items": [{"sku": f"item-{i}", "price": i % 100} for i in range(20_000)]}
+
+
+def per_call_us(expected) -> float:
+    """Best time per call over several runs, in microseconds, payloads being built beforehand."""
+    payloads = [payload() for _ in range(CALLS)]
+
+    def run():
+        for p in payloads:
+            send(p)
+
+    def setup():
+        tear_down()
+        Expect(send).to_receive(expected).and_return(True).times(CALLS)
+
+    return min(repeat(run, setup=setup, number=1, repeat=REPEAT)) / CALLS * 1e6
+
+
+def main() -> None:
+    scenarios = [
+        ("whole payload", payload()),
+        ("has_entries", has_entries(id=42, items=instance_of(list))),
+    ]
+    for name, expected in scenarios:
+        print(f"{name:<16} {per_call_us(expected):10.2f} us/call")
+    tear_down()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Memory footprint of permanent markers, and allocations of `Expect` statements across tests.
+
+Run from the root of the repository:
+
+    python -m benchmarks.memory
+"""
+
+import os
+import tracemalloc
+from contextlib import suppress
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise.exceptions import ExpectationError  # noqa: E402
+
+CLASSES = 200
+METHODS = 10
+TESTS = 200
+STATEMENTS = 20
+
+
+def make_class(name: str, decorator: str) -> type:
+    """Define a class with `METHODS` methods, decorated with the given decorator."""
+    method = "    {decorator}\n    def method_{j}(self, key):\n        return key\n\n"
+    methods = "".join(method.format(decorator=decorator, j=j) for j in range(METHODS))
+    namespace = {"__name__": __name__, "mock_if": mock_if}
+    exec(f"class {name}:\n{methods}", namespace)
+    return namespace[name]
+
+
+def measure_classes(prefix: str, decorator: str) -> tuple[int, int, list[type]]:
+    """
+    Memory allocated by `CLASSES` classes of `METHODS` decorated methods, in bytes, once defined and once each method
+    is accessed: markers are only registered in the session when their method is first used.
+    """
+    tracemalloc.start()
+    classes = [make_class(f"{prefix}{i}", decorator) for i in range(CLASSES)]
+    defined, _ = tracemalloc.get_traced_memory()
+    for klass in classes:
+        for j in range(METHODS):
+            getattr(klass, f"method_{j}")
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return defined, used, classes
+
+
+def measure_tests(classes: list[type]) -> tuple[int, int]:
+    """
+    Memory allocated by `TESTS` tests of `STATEMENTS` `Expect` statements each and still held afterwards, in bytes,
+    and number of memory blocks allocated by a single test.
+    """
+    methods = [klass.method_0 for klass in classes[:STATEMENTS]]
+    tracemalloc.start()
+    for _ in range(TESTS):
+        before = tracemalloc.take_snapshot()
+        for method in methods:
+            Expect(method).and_return(None)
+        blocks = sum(stat.count_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        with suppress(ExpectationError):
+            tear_down()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, blocks
+
+
+def main() -> None:
+    baseline_defined, baseline_used, _ = measure_classes("Undecorated", "")
+    defined, used, classes = measure_classes("Client", f"@mock_if({ENV_KEY!r}, 'test')")
+    markers = CLASSES * METHODS
+    for label, size in (("defined", defined - baseline_defined), ("used", used - baseline_used)):
+        print(f"{markers} permanent markers, {label}: {size / 1024:8.1f} KiB ({size / markers:.0f} B/marker)")
+    size, blocks = measure_tests(classes)
+    print(f"{TESTS} tests of {STATEMENTS} Expect statements: {size / 1024:8.1f} KiB held afterwards")
+    print(f"{STATEMENTS} Expect statements in a test: {blocks} new memory blocks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Throughput of method lookups on a class holding a mocked method, while tests keep describing and tearing down its
+mocked behavior. Mocked methods stand behind an interceptor for the lifetime of their marker, so that `Expect`
+statements and tear downs do not mutate the class, which would invalidate the type caches of the interpreter for the
+class and all its subclasses, and slow down lookups of every other attribute of the class.
+
+Run from the root of the repository:
+
+    python -m benchmarks.method_lookup
+"""
+
+import os
+from time import perf_counter_ns
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+
+CYCLES = 10_000  # tests describing and tearing down the mocked behavior
+ROUNDS = 5  # rounds of lookups of the plain methods, after each test
+REPEAT = 5
+
+
+class Hot:
+    @mock_if(ENV_KEY, "test")
+    def fetch(self, key):
+        return key
+
+    def m0(self):
+        pass
+
+    def m1(self):
+        pass
+
+    def m2(self):
+        pass
+
+    def m3(self):
+        pass
+
+    def m4(self):
+        pass
+
+
+# subclasses of a class are invalidated along with it, e.g. models sharing a base class
+SUBCLASSES = [type(f"Hot{i}", (Hot,), {}) for i in range(500)]
+
+
+class Cold:
+    """Same methods as `Hot`, on a class that no mock touches, to tell cache effects apart."""
+
+    m0 = Hot.m0
+    m1 = Hot.m1
+    m2 = Hot.m2
+    m3 = Hot.m3
+    m4 = Hot.m4
+
+
+def lookups(hot: Hot | Cold, rounds: int) -> None:
+    for _ in range(rounds):
+        hot.m0
+        hot.m1
+        hot.m2
+        hot.m3
+        hot.m4
+
+
+def run(hot: Hot, cold: Cold) -> tuple[float, float, float]:
+    """
+    Time lookups on the class holding the mocked method and on the untouched class between tests, and tests, in
+    nanoseconds per lookup or per test.
+    """
+    hot_ns = cold_ns = test_ns = 0
+    for _ in range(CYCLES):
+        start = perf_counter_ns()
+        Expect(Hot.fetch).to_receive(1).and_return(1)
+        hot.fetch(1)
+        tear_down()
+        tested = perf_counter_ns()
+        lookups(cold, ROUNDS)
+        cold_looked_up = perf_counter_ns()
+        lookups(hot, ROUNDS)
+        hot_looked_up = perf_counter_ns()
+        test_ns += tested - start
+        cold_ns += cold_looked_up - tested
+        hot_ns += hot_looked_up - cold_looked_up
+    lookups_count = CYCLES * ROUNDS * 5
+    return hot_ns / lookups_count, cold_ns / lookups_count, test_ns / CYCLES
+
+
+def main() -> None:
+    hot, cold = SUBCLASSES[-1](), Cold()
+    lookups(hot, 1000)  # warming up specializations
+    lookups(cold, 1000)
+    hot_ns, cold_ns, test_ns = (min(timings) for timings in zip(*(run(hot, cold) for _ in range(REPEAT))))
+    print(f"lookups between tests, on the class of the mocked method: {hot_ns:8.1f} ns/lookup")
+    print(f"lookups between tests, on an untouched class:            {cold_ns:8.1f} ns/lookup")
+    print(f"test (Expect, call, tear down):                          {test_ns:8.0f} ns/test")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Cost of calls forwarded from worker processes to the process holding the expectations, with `shared`, as the number
+of workers grows.
+
+Run from the root of the repository:
+
+    python -m benchmarks.processes
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import shared  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise import unordered  # noqa: E402
+
+CALLS = 20_000
+WORKERS = [1, 2, 4, 8]
+
+
+class Client:
+    @mock_if(ENV_KEY, "test")
+    def get(self, key):
+        return key
+
+
+def work(keys: range) -> int:
+    client = Client()
+    return sum(client.get(key) for key in keys)
+
+
+def main() -> None:
+    context = multiprocessing.get_context("fork")
+    for workers in WORKERS:
+        unordered(Client.get)
+        with shared(Client.get):
+            for key in range(CALLS):
+                Expect(Client.get).to_receive(key).and_return(key)
+            chunk = CALLS // workers
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                start = perf_counter()
+                total = sum(executor.map(work, [range(i * chunk, (i + 1) * chunk) for i in range(workers)]))
+                elapsed = perf_counter() - start
+        tear_down()
+        assert total == sum(range(CALLS))
+        per_call = elapsed / CALLS * 1e6
+        print(f"{workers} worker(s): {CALLS} forwarded calls in {elapsed:6.3f} s, {per_call:6.1f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Benchmark suite measuring how the main paths of Expectise scale with the number N of functions, statements or calls,
+side by side with `unittest.mock.patch` for equivalent scenarios.
+
+Results are printed per operation, and may be stored as JSON to be compared with a later run, e.g. before and after a
+change: operations slower than the baseline by more than the threshold are reported, and the exit status is 1.
+
+Sizes up to 100k take several minutes, mostly spent in `unittest.mock`. Run from the root of the repository:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+from argparse import ArgumentParser
+from contextlib import suppress
+from datetime import datetime
+from datetime import timezone
+from time import perf_counter
+from types import ModuleType
+from typing import Callable
+from unittest.mock import DEFAULT
+from unittest.mock import patch
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock  # noqa: E402
+from expectise import mock_class  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise.exceptions import ExpectationError  # noqa: E402
+from expectise.utils.diff import Diff  # noqa: E402
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+REPEAT = 5
+LARGEST = 10_000  # sizes above are run once
+THRESHOLD = 0.2
+EXPECTISE = "expectise"
+UNITTEST = "unittest.mock"
+
+
+def make_module(n: int) -> ModuleType:
+    """Create an importable module holding `n` plain functions, `func_0` to `func_{n-1}`."""
+    name = f"benchmarks.targets_{n}"
+    module = sys.modules[name] = ModuleType(name)
+    exec("".join(f"def func_{i}(key):\n    return key\n\n" for i in range(n)), module.__dict__)
+    return module
+
+
+def functions(module: ModuleType) -> list[tuple[str, Callable]]:
+    """Names and functions of a module created by `make_module`, in order."""
+    return [(name, value) for name, value in vars(module).items() if name.startswith("func_")]
+
+
+def make_class(n: int) -> type:
+    """Create a class of an importable module, holding `n` methods, `method_0` to `method_{n-1}`."""
+    module = make_module(0)
+    methods = "".join(f"    def method_{i}(self, key):\n        return key\n\n" for i in range(n))
+    exec(f"class Client:\n{methods}", vars(module))
+    return module.Client
+
+
+def make_marked_module(n: int) -> ModuleType:
+    """Create an importable module holding `n` functions decorated with `mock_if`."""
+    module = make_module(n)
+    decorator = mock_if(ENV_KEY, "test")
+    for name, function in functions(module):
+        setattr(module, name, decorator(function))
+    return module
+
+
+def reset() -> None:
+    """Tear down the session, ignoring the expected calls that were never performed."""
+    with suppress(ExpectationError):
+        tear_down()
+
+
+def timed(run: Callable[[], None]) -> float:
+    """Time a single run, in seconds, with the garbage collector disabled as `timeit` does."""
+    gc.collect()
+    gc.disable()
+    try:
+        start = perf_counter()
+        run()
+        return perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def mock_if_expectise(n: int) -> float:
+    """Decorate `n` functions with `mock_if`."""
+    module = make_module(n)
+    decorator = mock_if(ENV_KEY, "test")
+    targets = functions(module)
+
+    def run():
+        for name, function in targets:
+            setattr(module, name, decorator(function))
+
+    return timed(run)
+
+
+def mock_expectise(n: int) -> float:
+    """Mark `n` functions as temporarily mocked, with `mock`."""
+    targets = [function for _, function in functions(make_module(n))]
+
+    def run():
+        for function in targets:
+            mock(function)
+
+    elapsed = timed(run)
+    reset()
+    return elapsed
+
+
+def mock_unittest(n: int) -> float:
+    """Patch `n` functions with `patch.object`."""
+    module = make_module(n)
+    targets = [name for name, _ in functions(module)]
+
+    def run():
+        for name in targets:
+            patch.object(module, name).start()
+
+    elapsed = timed(run)
+    patch.stopall()
+    return elapsed
+
+
+def mock_class_expectise(n: int) -> float:
+    """Mark the `n` methods of a class as temporarily mocked, with `mock_class`."""
+    klass = make_class(n)
+    elapsed = timed(lambda: mock_class(klass))
+    reset()
+    return elapsed
+
+
+def mock_class_unittest(n: int) -> float:
+    """Patch the `n` methods of a class, with `patch.multiple`."""
+    klass = make_class(n)
+    names = [name for name in vars(klass) if name.startswith("method_")]
+    elapsed = timed(lambda: patch.multiple(klass, **{name: DEFAULT for name in names}).start())
+    patch.stopall()
+    return elapsed
+
+
+def expect_expectise(n: int) -> float:
+    """Describe the return value of `n` functions marked with `mock_if`, with one `Expect` statement each."""
+    targets = [function for _, function in functions(make_marked_module(n))]
+
+    def run():
+        for target in targets:
+            Expect(target).and_return(None)
+
+    elapsed = timed(run)
+    reset()
+    return elapsed
+
+
+def expect_unittest(n: int) -> float:
+    """Patch `n` functions with a return value, with `patch.object`."""
+    module = make_module(n)
+    targets = [name for name, _ in functions(module)]
+
+    def run():
+        for name in targets:
+            patch.object(module, name, return_value=None).start()
+
+    elapsed = timed(run)
+    patch.stopall()
+    return elapsed
+
+
+def dispatch_expectise(n: int) -> float:
+    """Call a mocked function `n` times, with the arguments checked."""
+    module = make_marked_module(1)
+    Expect(module.func_0).to_receive(1).and_return(None).times(n)
+    function = module.func_0
+
+    def run():
+        for _ in range(n):
+            function(1)
+
+    elapsed = timed(run)
+    tear_down()
+    return elapsed
+
+
+def dispatch_unittest(n: int) -> float:
+    """Call a patched function `n` times, and check the arguments of all calls."""
+    module = make_module(1)
+    with patch.object(module, "func_0", return_value=None) as function:
+
+        def run():
+            for _ in range(n):
+                function(1)
+            assert function.call_count == n
+            assert all(call.args == (1,) for call in function.call_args_list)
+
+        return timed(run)
+
+
+def tear_down_expectise(n: int) -> float:
+    """Tear down a session after `n` functions marked with `mock_if` were each called once, as expected."""
+    module = make_marked_module(n)
+    for _, function in functions(module):
+        Expect(function).and_return(None)
+    for _, function in functions(module):
+        function(1)  # the dispatchers replaced the decorated functions
+
+    return timed(tear_down)
+
+
+def tear_down_unittest(n: int) -> float:
+    """Stop `n` patches after each patched function was called once, checking the call."""
+    module = make_module(n)
+    patches = [patch.object(module, name, return_value=None) for name, _ in functions(module)]
+    mocks = [p.start() for p in patches]
+    for function in mocks:
+        function(1)
+
+    def run():
+        for function in mocks:
+            function.assert_called_once_with(1)
+        patch.stopall()
+
+    return timed(run)
+
+
+def diff_expectise(n: int) -> float:
+    """Render the diff of two payloads of `n` items, differing by their last item only."""
+    left = {"items": [{"id": i, "price": 10} for i in range(n)]}
+    right = {"items": [{"id": i, "price": 12 if i == n - 1 else 10} for i in range(n)]}
+    return timed(lambda: Diff.print(left, right))
+
+
+SCENARIOS = {
+    "mock_if": {EXPECTISE: mock_if_expectise},
+    "mock": {EXPECTISE: mock_expectise, UNITTEST: mock_unittest},
+    "mock_class": {EXPECTISE: mock_class_expectise, UNITTEST: mock_class_unittest},
+    "expect": {EXPECTISE: expect_expectise, UNITTEST: expect_unittest},
+    "dispatch": {EXPECTISE: dispatch_expectise, UNITTEST: dispatch_unittest},
+    "tear_down": {EXPECTISE: tear_down_expectise, UNITTEST: tear_down_unittest},
+    "diff": {EXPECTISE: diff_expectise},
+}
+
+
+def run_suite(scenarios: list[str], sizes: list[int], repeat: int) -> dict:
+    """
+    Run the scenarios for each size, keeping the best of at most `repeat` runs, and return the results in seconds per
+    operation, as `{scenario: {library: {size: seconds}}}`.
+    """
+    results = {}
+    for scenario in scenarios:
+        for library, benchmark in SCENARIOS[scenario].items():
+            timings = results.setdefault(scenario, {}).setdefault(library, {})
+            for n in sizes:
+                runs = repeat if n <= LARGEST else 1  # larger sizes are less noisy, and much slower
+                timings[str(n)] = min(benchmark(n) for _ in range(runs)) / n
+                print(f"{scenario:<10} {library:<14} N={n:<8} {timings[str(n)] * 1e9:12.1f} ns/op", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List the operations slower than in the baseline by more than the threshold, as a ratio."""
+    regressions = []
+    for scenario, libraries in results.items():
+        for library, timings in libraries.items():
+            for n, seconds in timings.items():
+                reference = baseline.get(scenario, {}).get(library, {}).get(n)
+                if reference and seconds > reference * (1 + threshold):
+                    regressions.append(
+                        f"{scenario} ({library}, N={n}): {reference * 1e9:.1f} -> {seconds * 1e9:.1f} ns/op "
+                        f"({seconds / reference - 1:+.0%})"
+                    )
+    return regressions
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Number of runs, the best of which is kept.")
+    parser.add_argument("--output", help="Path of the JSON file the results are written to.")
+    parser.add_argument("--compare", help="Path of a JSON file of baseline results to compare with.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="Slowdown ratio reported as regression.")
+    args = parser.parse_args()
+
+    results = run_suite(args.scenarios, args.sizes, args.repeat)
+
+    print()
+    for scenario in args.scenarios:
+        libraries = results[scenario]
+        if UNITTEST in libraries:
+            ratios = (libraries[UNITTEST][n] / libraries[EXPECTISE][n] for n in libraries[EXPECTISE])
+            print(f"{scenario:<10} {UNITTEST} / {EXPECTISE}: " + ", ".join(f"{ratio:.1f}x" for ratio in ratios))
+
+    if args.output:
+        metadata = {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        }
+        with open(args.output, "w") as f:
+            json.dump({"metadata": metadata, "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if regressions := compare(results, baseline["results"], args.threshold):
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            print("\n".join(regressions))
+            return 1
+        print(f"\nNo regression over {args.threshold:.0%} compared to {args.compare}.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
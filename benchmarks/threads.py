@@ -0,0 +1,52 @@
+"""
+Throughput of a mocked function called concurrently from a pool of threads, compared to a single thread.
+
+Run from the root of the repository:
+
+    python -m benchmarks.threads
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+
+CALLS = 320_000
+THREADS = [1, 4, 32]
+
+
+@mock_if(ENV_KEY, "test")
+def fetch(key):
+    return key
+
+
+def per_call_ns(threads: int) -> float:
+    """Time per mocked call when `CALLS` calls are spread over `threads` threads, in nanoseconds."""
+    for _ in range(CALLS):
+        Expect(fetch).and_return(None)
+
+    def worker(_):
+        for _ in range(CALLS // threads):
+            fetch(1)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    elapsed = perf_counter() - start
+    tear_down()  # raises if some expected calls were not consumed, or consumed twice
+    return elapsed / CALLS * 1e9
+
+
+def main() -> None:
+    for threads in THREADS:
+        print(f"{threads:>3} thread(s) {per_call_ns(threads):8.1f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
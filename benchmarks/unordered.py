@@ -0,0 +1,48 @@
+"""
+Cost of calls received in any order, in unordered mode: each call claims the `Expect` statement expecting its arguments
+through the index of arguments, whatever the number of statements left.
+
+Run from the root of the repository:
+
+    python -m benchmarks.unordered
+"""
+
+import os
+import random
+from time import perf_counter
+
+ENV_KEY = "EXPECTISE_BENCHMARK_ENV"
+os.environ[ENV_KEY] = "test"
+
+from expectise import Expect  # noqa: E402
+from expectise import mock_if  # noqa: E402
+from expectise import tear_down  # noqa: E402
+from expectise import unordered  # noqa: E402
+
+SIZES = [100, 1_000, 10_000, 50_000]
+
+
+class Client:
+    @mock_if(ENV_KEY, "test")
+    def get(self, key, version=None):
+        return key
+
+
+def main() -> None:
+    client = Client()
+    for size in SIZES:
+        keys = list(range(size))
+        unordered(Client.get)
+        for key in keys:
+            Expect(Client.get).to_receive(key, version=1).and_return(key)
+        random.shuffle(keys)
+        start = perf_counter()
+        for key in keys:
+            client.get(key, version=1)
+        elapsed = perf_counter() - start
+        tear_down()
+        print(f"{size:>8} statements, called in random order: {elapsed / size * 1e6:8.2f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import asyncio
+
+from expectise import mock_if
+
+
+class SomeAsyncAPI:
+    @mock_if("ENV", "test")
+    async def fetch(self, key):
+        await asyncio.sleep(1)
+        return f"fetched {key}"
+
+    @mock_if("ENV", "test")
+    @classmethod
+    async def connect(cls, host):
+        await asyncio.sleep(1)
+        return f"connected to {host}"
+
+
+@mock_if("ENV", "test")
+async def fetch_all(keys):
+    await asyncio.sleep(1)
+    return [f"fetched {key}" for key in keys]
@@ -30,3 +30,8 @@ def my_subtraction(a: int, b: int) -> int:
 @mock_if("ENV", "dev")
 def debug():
     return "[DEBUG] This has to be a flaky operation"
+
+
+@mock_if("ENV", "dev", lazy=True)
+def lazy_debug():
+    return "[DEBUG] This one is checked on every call"
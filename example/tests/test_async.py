@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from some_module import some_async_api
+from some_module.some_async_api import SomeAsyncAPI
+
+from expectise import Expect
+from expectise import Expectations
+from expectise.exceptions import EnvironmentError
+from expectise.exceptions import ExpectationError
+
+
+"""
+This example focuses on testing coroutine functions and methods, defined with `async def`.
+Mocked coroutine functions return coroutines, like the original ones: the expected return value is returned, or the
+expected error raised, when the coroutine is awaited.
+"""
+
+
+def test_async_method():
+    # Without the appropriate `Expect` statement, awaiting the mocked coroutine raises an error.
+    with pytest.raises(EnvironmentError):
+        asyncio.run(SomeAsyncAPI().fetch("foo"))
+
+
+def test_async_method_return():
+    # The mocked method returns a coroutine, and awaiting it returns the expected value, without any actual sleep.
+    with Expectations():
+        Expect(SomeAsyncAPI.fetch).to_receive("foo").and_return("mocked foo")
+        assert asyncio.run(SomeAsyncAPI().fetch("foo")) == "mocked foo"
+
+
+def test_async_classmethod_raise():
+    # Errors are raised when the coroutine is awaited, not when the coroutine function is called.
+    with Expectations():
+        Expect(SomeAsyncAPI.connect).to_receive("localhost").and_raise(ConnectionError("Connection refused"))
+        coroutine = SomeAsyncAPI.connect("localhost")
+        with pytest.raises(ConnectionError):
+            asyncio.run(coroutine)
+
+
+def test_async_function_called_with_unexpected_args():
+    # Arguments are checked when the coroutine is awaited too.
+    with Expectations():
+        Expect(some_async_api.fetch_all).to_receive(["foo"]).and_return(["mocked foo"])
+        with pytest.raises(ExpectationError):
+            asyncio.run(some_async_api.fetch_all(["bar"]))
+
+
+def test_async_function_gathered():
+    # Many concurrent tasks scheduled on the same event loop consume one `Expect` statement each.
+    async def fetch_concurrently(n):
+        return await asyncio.gather(*[some_async_api.fetch_all([i]) for i in range(n)])
+
+    with Expectations():
+        for i in range(5_000):
+            Expect(some_async_api.fetch_all).and_return(i)
+        assert sorted(asyncio.run(fetch_concurrently(5_000))) == list(range(5_000))
@@ -0,0 +1,93 @@
+import pytest
+from some_module import some_functions
+from some_module.some_api import SomeAPI
+
+from expectise import cassette
+from expectise import Expect
+from expectise import Expectations
+from expectise import mock
+from expectise.exceptions import EnvironmentError
+from expectise.exceptions import ExpectationError
+
+
+"""
+This example focuses on cassettes: instead of describing calls with `Expect` statements, calls to the original
+functions and methods are recorded into a file once, and replayed as expectations afterwards. Recorded calls are read
+lazily from the file, so that large recordings only cost what tests consume.
+"""
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / "compute.cassette"
+    # The cassette file does not exist yet: calls are forwarded to the original methods and recorded, errors included.
+    with Expectations():
+        mock(some_functions.my_division)
+        with cassette(path, SomeAPI.compute_sum, some_functions.my_division) as recording:
+            assert recording.record
+            assert SomeAPI.compute_sum(1, 2) == 3
+            assert some_functions.my_division(6, b=3) == 2
+            with pytest.raises(ZeroDivisionError):
+                some_functions.my_division(1, 0)
+
+    # The cassette file exists, so recorded calls are expected, and their recorded outcome is returned or raised.
+    with Expectations():
+        mock(some_functions.my_division)
+        with cassette(path, SomeAPI.compute_sum, some_functions.my_division) as replay:
+            assert not replay.record
+            assert SomeAPI.compute_sum(1, 2) == 3
+            assert some_functions.my_division(6, b=3) == 2
+            with pytest.raises(ZeroDivisionError):
+                some_functions.my_division(1, 0)
+
+
+def test_replay_checks_calls(tmp_path):
+    path = tmp_path / "compute.cassette"
+    with Expectations():
+        with cassette(path, SomeAPI.compute_sum, record=True):
+            for i in range(3):
+                SomeAPI.compute_sum(i, 1)
+
+    # `Expect` statements are used first, then recorded calls, which are checked against the arguments recorded.
+    with Expectations():
+        with cassette(path, SomeAPI.compute_sum):
+            Expect(SomeAPI.compute_sum).to_receive(5, 5).and_return(0)
+            assert SomeAPI.compute_sum(5, 5) == 0
+            assert SomeAPI.compute_sum(0, 1) == 1
+            with pytest.raises(ExpectationError, match="unexpected positional arguments"):
+                SomeAPI.compute_sum(1, 2)
+            assert SomeAPI.compute_sum(2, 1) == 3
+
+    # Recorded calls that are not performed are reported when tearing down, as for `Expect` statements.
+    with pytest.raises(ExpectationError, match="still expected to be called 3 time"):
+        with Expectations():
+            with cassette(path, SomeAPI.compute_sum):
+                pass
+
+
+def test_cassette_exit(tmp_path):
+    path = tmp_path / "compute.cassette"
+    # A recording interrupted by an error is incomplete, so the cassette file is removed.
+    with Expectations():
+        with pytest.raises(RuntimeError):
+            with cassette(path, SomeAPI.compute_sum):
+                SomeAPI.compute_sum(1, 2)
+                raise RuntimeError("interrupted")
+    assert not path.exists()
+
+    with Expectations():
+        with cassette(path, SomeAPI.compute_sum):
+            SomeAPI.compute_sum(1, 2)
+
+    # Once the cassette exits, recorded calls are not replayed anymore, and the mock is back in place.
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            with cassette(path, SomeAPI.compute_sum):
+                pass
+            with pytest.raises(EnvironmentError):
+                SomeAPI.compute_sum(1, 2)
+
+
+def test_cassette_requires_markers(tmp_path):
+    # As for `Expect` statements, only functions and methods marked as mocked can be recorded or replayed.
+    with pytest.raises(EnvironmentError):
+        cassette(tmp_path / "root.cassette", some_functions.my_root)
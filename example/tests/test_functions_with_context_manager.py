@@ -1,3 +1,6 @@
+from itertools import count
+from types import FunctionType
+
 import pytest
 from some_module import some_functions
 
@@ -5,8 +8,10 @@ from expectise import disable_mock
 from expectise import Expect
 from expectise import Expectations
 from expectise import mock
+from expectise import mock_module
 from expectise.exceptions import EnvironmentError
 from expectise.exceptions import ExpectationError
+from expectise.lib.session import session
 
 
 """
@@ -47,6 +52,15 @@ def test_function_called_with_args():
             some_functions.my_square(a=4)
 
 
+def test_function_called_with_large_unexpected_payload():
+    # When arguments do not match expectations, the `ExpectationError` message lists the paths where they differ.
+    # This remains fast even for large arguments.
+    with Expectations():
+        Expect(some_functions.my_square).to_receive({"items": [{"price": 10} for _ in range(50_000)]}).and_return(0)
+        with pytest.raises(ExpectationError, match=r"\[0\]\['items'\]\[4312\]\['price'\]"):
+            some_functions.my_square({"items": [{"price": 12 if i == 4312 else 10} for i in range(50_000)]})
+
+
 def test_function_return():
     # Expecting the function `my_sum` to be called, with specifc arguments passed to it, and overriding its
     # behavior to return a desired output. This test case checks that the function is called, with the right input,
@@ -78,6 +92,116 @@ def test_function_called_twice():
         assert some_functions.my_sum(1, 2) == 5
 
 
+def test_function_called_n_times():
+    # A single `Expect` statement can describe several identical calls, however many they are.
+    with Expectations():
+        Expect(some_functions.my_sum).to_receive(1, 2).and_return(4).times(100_000)
+        Expect(some_functions.my_sum).to_receive(1, 2).and_return(5)
+        assert all(some_functions.my_sum(1, 2) == 4 for _ in range(100_000))
+        assert some_functions.my_sum(1, 2) == 5
+        with pytest.raises(ExpectationError, match="expected to be called 100001 time"):
+            some_functions.my_sum(1, 2)
+
+
+def test_function_called_at_least_n_times():
+    # Missing calls are detected when tearing down.
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            Expect(some_functions.my_sum).and_return(4).at_least(2)
+            assert some_functions.my_sum(1, 2) == 4
+
+    # Extra calls are allowed.
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(4).at_least(2)
+        assert all(some_functions.my_sum(1, 2) == 4 for _ in range(3))
+
+    # Once the minimum number of calls is received, calls expected by the next statement are checked against it.
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(4).at_least(2)
+        Expect(some_functions.my_sum).to_receive(5, 5).and_return(10)
+        assert [some_functions.my_sum(1, 2) for _ in range(3)] == [4, 4, 4]
+        assert some_functions.my_sum(5, 5) == 10
+        with pytest.raises(ExpectationError, match="expected to be called 3 time"):
+            some_functions.my_sum(1, 2)
+
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(1).at_least(1)
+        Expect(some_functions.my_sum).and_return(2)
+        assert [some_functions.my_sum(1, 2) for _ in range(2)] == [1, 2]
+
+
+def test_function_called_any_number_of_times():
+    # The function may not be called at all.
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(4).any_number_of_times()
+
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(4).any_number_of_times()
+        assert all(some_functions.my_sum(1, 2) == 4 for _ in range(3))
+
+    # Such statements are expectations nonetheless, that checkpoints cannot hold.
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(4).any_number_of_times()
+        with pytest.raises(EnvironmentError, match="checkpoints cannot hold expectations"):
+            session.checkpoint()
+
+
+def test_function_return_each():
+    # Consecutive calls return consecutive outputs, pulled from a generator only when calls are received: pages of
+    # a paginated API can be produced on the fly, without holding all of them in memory.
+    produced = []
+
+    def pages():
+        for i in range(10_000):
+            produced.append(i)
+            yield {"page": i, "items": list(range(100))}
+
+    with Expectations():
+        Expect(some_functions.my_square).and_return_each(pages())
+        assert some_functions.my_square(1)["page"] == 0
+        assert produced == [0]
+        assert all(some_functions.my_square(1)["page"] == i for i in range(1, 10_000))
+
+        # Once outputs are exhausted, further calls raise an error.
+        with pytest.raises(ExpectationError):
+            some_functions.my_square(1)
+
+
+def test_function_return_each_not_exhausted():
+    # Outputs that were never returned are reported as missing calls when tearing down, without pulling all of them.
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            Expect(some_functions.my_square).and_return_each(iter([1, 2, 3]))
+            assert some_functions.my_square(1) == 1
+
+    # Unless a number of calls is specified explicitly.
+    with Expectations():
+        Expect(some_functions.my_square).and_return_each(iter([1, 2, 3])).times(2)
+        Expect(some_functions.my_square).and_return(0)
+        assert [some_functions.my_square(1) for _ in range(3)] == [1, 2, 0]
+
+
+def test_function_return_each_then_return():
+    # Once outputs are exhausted, further calls are checked against the next `Expect` statements.
+    with Expectations():
+        Expect(some_functions.my_square).and_return_each(iter([1, 2]))
+        Expect(some_functions.my_square).to_receive(3).and_return(9)
+        assert [some_functions.my_square(3) for _ in range(3)] == [1, 2, 9]
+
+    # Exhausted outputs are detected before checking the arguments, against the statement expecting them.
+    with Expectations():
+        Expect(some_functions.my_square).to_receive(1).and_return_each([10])
+        Expect(some_functions.my_square).to_receive(2).and_return(20)
+        assert some_functions.my_square(1) == 10
+        assert some_functions.my_square(2) == 20
+
+    # Even when the outputs are produced endlessly, tearing down does not wait for them to be exhausted.
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            Expect(some_functions.my_square).and_return_each(count())
+            assert some_functions.my_square(1) == 0
+
+
 def test_function_raise():
     # Expecting the function `my_sum` to be called, with specifc arguments passed to it, and overriding its
     # behavior to raise the desired error. This test case checks that the function is called, with the right input,
@@ -139,6 +263,29 @@ def test_mock_function_with_local_reference():
             assert my_root(4) == 2
 
 
+def test_mock_module():
+    # All functions defined by a module can be mocked at once. Functions marked already with `mock_if` are left
+    # untouched, as well as functions imported from other modules.
+    with Expectations():
+        mocked = mock_module(some_functions, exclude=["my_product"])
+        assert mocked == ["my_root", "my_division", "my_subtraction", "debug"]
+        assert some_functions.my_product(2, 3) == 6
+        with pytest.raises(EnvironmentError):
+            some_functions.my_division(6, 3)
+
+        Expect(some_functions.my_subtraction).to_receive(3, 1).and_return(0)
+        assert some_functions.my_subtraction(3, 1) == 0
+
+    # All functions are restored when tearing down.
+    assert some_functions.my_division(6, 3) == 2
+
+    # Functions whose marker was disabled are left untouched as well, instead of being marked again.
+    with Expectations():
+        disable_mock(some_functions.my_square)
+        assert "my_square" not in mock_module(some_functions)
+        assert some_functions.my_square(3) == 9
+
+
 def test_tear_down_keeps_permanent_mocks():
     # This test ensures that permanent mocks (i.e. those created with mock_if) are not removed by tear_down
     with Expectations():
@@ -150,8 +297,39 @@ def test_tear_down_keeps_permanent_mocks():
 
 
 def test_function_mocked_in_other_environment():
-    # A function mocked with mock_if and unmet environment conditions is left unchanged
+    # A function mocked with mock_if and unmet environment conditions is left unchanged: the decorator returns the
+    # original function object itself, so calling it does not carry any overhead.
+    assert isinstance(some_functions.debug, FunctionType)
     assert some_functions.debug() == "[DEBUG] This has to be a flaky operation"
     # Any attempt to mock it will raise an error
     with pytest.raises(EnvironmentError):
         Expect(some_functions.debug).to_return("Found it!")
+
+
+def test_lazy_function_mocked_in_other_environment():
+    # With `lazy=True`, the marker is registered anyway, and environment conditions are checked when the function is
+    # called. They are still not met here, so the original function is called.
+    assert some_functions.lazy_debug() == "[DEBUG] This one is checked on every call"
+    # Any attempt to mock it will raise an error
+    with pytest.raises(EnvironmentError):
+        Expect(some_functions.lazy_debug).to_return("Found it!")
+
+
+def test_function_stats():
+    # Stats can be collected for each marker, to find out which mocks are the most expensive ones. Only mocked calls
+    # set up while stats are enabled are instrumented.
+    session.enable_stats()
+    try:
+        with Expectations():
+            Expect(some_functions.my_square).to_receive(2).and_return(4)
+            Expect(some_functions.my_square).to_receive(2).and_return(4)
+            assert some_functions.my_square(2) == 4
+            with pytest.raises(ExpectationError):
+                some_functions.my_square(3)
+
+        stats = session.stats()["some_module.some_functions.my_square"]
+        assert (stats["statements"], stats["calls"]) == (2, 2)
+        assert stats["diff_ns"] > 0
+    finally:
+        session.disable_stats()
+    assert session.stats() == {}
@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import expectise
+
+
+"""
+This example focuses on the cost of importing Expectise in production code: `mock_if` is imported on its own, and the
+rest of the package (the session, mocks, `typing`, `enum`...) is only imported when first used, by tests.
+"""
+
+
+def test_production_import():
+    env = {key: value for key, value in os.environ.items() if key != "ENV"}
+    code = "import sys; before = set(sys.modules); from expectise import mock_if; print(*set(sys.modules) - before)"
+    process = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    imported = set(process.stdout.split())
+    assert "expectise.hooks.mock_if" in imported
+    assert not imported & {"expectise.lib.session", "expectise.lib.mock", "expectise.models.lifespan", "enum", "typing"}
+
+
+def test_lazy_attributes():
+    # Other attributes are imported on first access, and listed as usual.
+    assert {"Expect", "Expectations", "mock", "mock_if"} <= set(dir(expectise))
+    assert expectise.mock.__module__ == "expectise.hooks.mock"
+    assert expectise.Expect.__name__ == "Expect"
+    assert not hasattr(expectise, "unknown")
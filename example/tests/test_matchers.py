@@ -0,0 +1,79 @@
+from collections import namedtuple
+from collections import OrderedDict
+
+import pytest
+from some_module import some_functions
+from some_module.some_api import SomeAPI
+
+from expectise import anything
+from expectise import Expect
+from expectise import Expectations
+from expectise import has_entries
+from expectise import instance_of
+from expectise import mock
+from expectise import satisfies
+from expectise.exceptions import ExpectationError
+
+
+"""
+This example focuses on matchers: instead of describing the exact arguments a function or method should be called with,
+`to_receive` accepts matchers describing only the part of the arguments you care about. Only that part is examined when
+the call is received, which keeps the check cheap even when the arguments are large.
+"""
+
+Point = namedtuple("Point", ["x", "y"])
+
+
+def test_anything_and_instance_of():
+    # `anything()` accepts any argument, `instance_of` accepts instances of the given type(s) only.
+    with Expectations():
+        Expect(some_functions.my_sum).to_receive(anything(), instance_of(int)).and_return(3).times(2)
+        assert some_functions.my_sum("foo", 2) == 3
+        assert some_functions.my_sum(None, 2) == 3
+
+        Expect(SomeAPI.get_something).to_receive(instance_of(int, float), param_2=anything()).and_return(True)
+        with pytest.raises(ExpectationError):
+            SomeAPI.get_something("1", param_2=2)
+
+
+def test_has_entries():
+    # `has_entries` only looks up the given keys of a mapping, whatever its other entries. Values can be matchers too.
+    payload = {"id": 42, "status": "paid", "items": [{"price": 10} for _ in range(50_000)]}
+    with Expectations():
+        Expect(some_functions.my_square).to_receive(has_entries(id=42, items=instance_of(list))).and_return(0)
+        assert some_functions.my_square(payload) == 0
+
+        # When a call does not match, the error lists the arguments that do not match the matchers.
+        Expect(some_functions.my_square).to_receive(has_entries({"status": "refunded"})).and_return(0)
+        with pytest.raises(ExpectationError, match=r"has_entries\(\{'status': 'refunded'\}\)"):
+            some_functions.my_square(payload)
+
+
+def test_satisfies():
+    # `satisfies` accepts arguments for which the given predicate is true.
+    with Expectations():
+        mock(some_functions.my_root)
+        Expect(some_functions.my_root).to_receive(a=satisfies(lambda a: a >= 0)).and_return(2)
+        assert some_functions.my_root(a=4) == 2
+
+        Expect(some_functions.my_root).to_receive(a=satisfies(lambda a: a >= 0)).and_return(2)
+        with pytest.raises(ExpectationError):
+            some_functions.my_root(a=-4)
+
+
+def test_matchers_in_containers():
+    # Matchers can be nested in dictionaries, lists and tuples, which are then compared element by element.
+    with Expectations():
+        Expect(some_functions.my_square).to_receive([1, anything(), {"a": instance_of(str)}]).and_return(0)
+        assert some_functions.my_square([1, object(), {"a": "b"}]) == 0
+
+        Expect(some_functions.my_square).to_receive([1, anything()]).and_return(0)
+        with pytest.raises(ExpectationError):
+            some_functions.my_square([1, 2, 3])
+
+        # Subclasses of dictionaries, lists and tuples are compared element by element as well.
+        Expect(some_functions.my_square).to_receive(OrderedDict(a=anything())).and_return(0)
+        assert some_functions.my_square(OrderedDict(a=1)) == 0
+
+        Expect(some_functions.my_square).to_receive(Point(x=1, y=anything())).and_return(0)
+        assert some_functions.my_square(Point(x=1, y=2)) == 0
@@ -1,12 +1,16 @@
 import pytest
 from some_module.some_api import SomeAPI
+from some_module.some_other_api import SomeOtherAPI
 
 from expectise import disable_mock
 from expectise import Expect
 from expectise import Expectations
 from expectise import mock
+from expectise import mock_class
+from expectise import spy
 from expectise.exceptions import EnvironmentError
 from expectise.exceptions import ExpectationError
+from expectise.lib.session import session
 
 
 """
@@ -47,6 +51,19 @@ def test_method_called_with_args():
             SomeAPI.do_something_else(x=13)
 
 
+def test_method_called_with_unexpected_positional_args():
+    # The class bound to the method is not part of the expected arguments: only the arguments explicitly passed
+    # are compared, and reported in the error message when they do not match.
+    with Expectations():
+        Expect(SomeAPI.get_something).to_receive("foo", "bar").and_return(True)
+        with pytest.raises(ExpectationError, match="unexpected positional arguments") as error:
+            SomeAPI.get_something("foo", "baz")
+
+    # The error carries the expected and actual arguments, their diff being rendered only when the error is displayed.
+    assert error.value.expected == ("foo", "bar")
+    assert error.value.actual == ("foo", "baz")
+
+
 def test_method_return():
     # Expecting the method `get_something` to be called, with specifc arguments passed to it, and overriding its
     # behavior to return a desired output. This test case checks that the method is called, with the right input,
@@ -140,6 +157,97 @@ def test_tear_down_disables_temporary_mocks():
     assert some_api.unmocked_method() == "unmocked"
 
 
+def test_mock_class():
+    # All methods, class methods, static methods and properties defined by a class can be mocked at once. Special
+    # methods such as `__init__` are left out, so the class can still be instantiated.
+    with Expectations():
+        assert mock_class(SomeOtherAPI) == ["do_advanced_stuff", "secret_info", "encrypt"]
+        api = SomeOtherAPI(foo=2)
+        with pytest.raises(EnvironmentError):
+            api.do_advanced_stuff("bar")
+
+        Expect(SomeOtherAPI.secret_info).to_return("********")
+        Expect(SomeOtherAPI.encrypt).to_receive("password").and_return("mocked")
+        assert api.secret_info == "********"
+        assert SomeOtherAPI.encrypt("password") == "mocked"
+
+    # All methods are restored when tearing down.
+    assert SomeOtherAPI(foo=2).do_advanced_stuff("bar") == "bar>>2"
+    assert SomeOtherAPI().secret_info == "P@55W0RD"
+
+
+def test_mock_class_include_exclude():
+    # Mocked methods can be selected by name. Methods marked already, with `mock_if` here, are left untouched.
+    with Expectations():
+        assert mock_class(SomeOtherAPI, include=["encrypt"]) == ["encrypt"]
+        assert mock_class(SomeOtherAPI, exclude=["secret_info"]) == ["do_advanced_stuff"]
+        assert SomeOtherAPI().secret_info == "P@55W0RD"
+        # `dev_method` is only marked in the `dev` environment, so it can be mocked here.
+        assert mock_class(SomeAPI, exclude=["unmocked_method"]) == ["dev_method"]
+
+        # Explicitly included names that cannot be mocked raise an error.
+        with pytest.raises(EnvironmentError):
+            mock_class(SomeOtherAPI, include=["foo"])
+
+
+def test_checkpoint():
+    # A checkpoint keeps the markers set up so far: restoring it only resets the markers touched since then, so that
+    # heavy mocking configurations can be shared by several tests, typically through a module-scoped fixture.
+    mock_class(SomeOtherAPI)
+    disable_mock(SomeAPI.mocked_method)
+    checkpoint = session.checkpoint()
+    try:
+        for _ in range(2):
+            Expect(SomeOtherAPI.encrypt).to_receive("password").and_return("mocked")
+            assert SomeOtherAPI.encrypt("password") == "mocked"
+            mock(SomeAPI.unmocked_method)
+            disable_mock(SomeAPI.update_attribute)
+            session.restore(checkpoint)
+
+            # Mocks of the checkpoint are still in place, markers disabled back then only are disabled,
+            # and markers created since then are removed.
+            with pytest.raises(EnvironmentError):
+                SomeOtherAPI.encrypt("password")
+            with pytest.raises(EnvironmentError):
+                SomeAPI().update_attribute("value")
+            assert SomeAPI().mocked_method() == "mocked"
+            assert SomeAPI().unmocked_method() == "unmocked"
+
+        # Missing calls are reported when restoring, as when tearing down.
+        Expect(SomeOtherAPI.encrypt).to_return("mocked")
+        with pytest.raises(ExpectationError):
+            session.restore(checkpoint)
+    finally:
+        session.tear_down()
+
+    assert SomeOtherAPI.encrypt("password") == "********"
+    with pytest.raises(EnvironmentError):
+        SomeAPI().mocked_method()
+
+
+def test_nested_checkpoints():
+    # Tearing down only drops the latest checkpoint, e.g. taken by a module-scoped fixture, and restores the session to
+    # the previous one, e.g. taken by a session-scoped fixture. Spies standing for methods back then are set back too.
+    calls = spy(SomeAPI.compute_sum)
+    outer = session.checkpoint()
+    try:
+        mock_class(SomeOtherAPI)
+        session.checkpoint()
+        assert SomeAPI.compute_sum(1, 2) == 3
+        session.tear_down()
+
+        assert session.checkpoints == [outer]
+        assert SomeOtherAPI.encrypt("password") == "********"
+        assert SomeAPI.compute_sum(1, 2) == 3
+        assert calls.call_count == 2
+    finally:
+        session.tear_down()
+
+    assert session.checkpoints == []
+    with pytest.raises(EnvironmentError):
+        SomeAPI.compute_sum(1, 2)
+
+
 def test_tear_down_keeps_permanent_mocks():
     # This test ensures that permanent mocks (i.e. those
     # created with mock_if - wen in the test environment)
@@ -159,3 +267,22 @@ def test_method_mocked_in_other_environment():
     # Any attempt to mock it will raise an error
     with pytest.raises(EnvironmentError):
         Expect(SomeAPI.dev_method).to_return("no downtime")
+
+
+def test_class_not_mutated_by_tests():
+    # Mocked methods stand behind a single interceptor in their class for the lifetime of their marker: `Expect`
+    # statements and tear downs do not mutate the class, which would slow down further attribute lookups.
+    SomeAPI.compute_sum  # the marker is set up on first access
+    interceptor = vars(SomeAPI)["compute_sum"]
+    with Expectations():
+        Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return(0)
+        assert SomeAPI.compute_sum(1, 2) == 0
+    assert vars(SomeAPI)["compute_sum"] is interceptor
+
+    # Temporary markers are removed for good when tearing down, leaving the original method in the class.
+    original = vars(SomeAPI)["unmocked_method"]
+    with Expectations():
+        mock(SomeAPI.unmocked_method)
+        Expect(SomeAPI.unmocked_method).to_return("mocked")
+        assert SomeAPI().unmocked_method() == "mocked"
+    assert vars(SomeAPI)["unmocked_method"] is original
@@ -0,0 +1,150 @@
+import json
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+
+"""
+This example focuses on the pytest plugin shipped with Expectise, that is registered automatically once the package is
+installed. Each test below runs a small test module of its own, with the plugin enabled explicitly (`-p`) so that these
+examples also work from a source checkout.
+The plugin tears down the Expectise session automatically, and provides an `expect` fixture.
+"""
+
+TEST_MODULE = """
+from expectise import mock
+
+
+def fetch(key):
+    return key
+"""
+
+
+@pytest.fixture
+def run(pytester):
+    def run(source, *args):
+        pytester.makepyfile(TEST_MODULE + source)
+        return pytester.runpytest("-p", "expectise.plugin", *args)
+
+    return run
+
+
+def test_expect_fixture(run):
+    # The `expect` fixture is the `Expect` class, and missing calls are reported when tearing down the test.
+    result = run(
+        """
+def test_call(expect):
+    mock(fetch)
+    expect(fetch).to_receive(1).and_return(3)
+    assert fetch(1) == 3
+
+
+def test_missing_call(expect):
+    mock(fetch)
+    expect(fetch).and_return(3)
+"""
+    )
+    result.assert_outcomes(passed=2, errors=1)
+    result.stdout.fnmatch_lines(["*ExpectationError*still expected to be called 1 time(s)*"])
+
+
+def test_automatic_tear_down(run):
+    # Temporary mocks are removed after each test, even without using the `expect` fixture.
+    result = run(
+        """
+def test_mock():
+    mock(fetch)
+
+
+def test_unmocked():
+    assert fetch(1) == 1
+"""
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_module_scope(run):
+    # With a module scope, the session is torn down once all tests of the module have run: expectations may span
+    # several tests.
+    result = run(
+        """
+def test_expect(expect):
+    mock(fetch)
+    expect(fetch).and_return(3)
+
+
+def test_call(expect):
+    assert fetch(1) == 3
+""",
+        "--expectise-scope=module",
+    )
+    result.assert_outcomes(passed=2)
+
+
+def test_report(run):
+    # Marker counts are reported for each worker, or for the main process when tests are not distributed.
+    result = run(
+        """
+def test_call(expect):
+    mock(fetch)
+    expect(fetch).and_return(3)
+    assert fetch(1) == 3
+""",
+        "--expectise-report",
+    )
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*expectise*", "main: * markers, 1 touched during tests"])
+
+
+def test_stats(run, pytester):
+    # Stats of each marker are collected and written to a JSON file at the end of the run, with durations in ns.
+    result = run(
+        """
+def test_calls(expect):
+    mock(fetch)
+    expect(fetch).to_receive(1).and_return(3).times(2)
+    assert fetch(1) == 3
+    assert fetch(1) == 3
+""",
+        "--expectise-stats=stats.json",
+    )
+    result.assert_outcomes(passed=1)
+    stats = json.loads((pytester.path / "stats.json").read_text())
+    assert stats["worker_id"] == "main"
+    fetch_stats = stats["markers"]["test_stats.fetch"]
+    assert (fetch_stats["statements"], fetch_stats["calls"]) == (1, 2)
+    assert fetch_stats["argument_check_ns"] > 0 and fetch_stats["tear_down_ns"] > 0
+
+
+def test_checkpoint(run):
+    # A module-scoped fixture can set up mocks once, and take a checkpoint: each test restores the session to it,
+    # instead of tearing it down. The fixture tears the session down once all tests of the module have run.
+    result = run(
+        """
+import pytest
+from expectise import Expect
+from expectise.exceptions import EnvironmentError
+from expectise.lib.session import session
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mocks():
+    mock(fetch)
+    session.checkpoint()
+    yield
+    session.tear_down()
+
+
+def test_first():
+    Expect(fetch).and_return(3)
+    assert fetch(1) == 3
+
+
+def test_second():
+    # the mock set up by the fixture is still in place, without the expectations of the previous test
+    with pytest.raises(EnvironmentError):
+        fetch(1)
+"""
+    )
+    result.assert_outcomes(passed=2)
@@ -0,0 +1,83 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from some_module import some_functions
+from some_module.some_api import SomeAPI
+
+from expectise import Expect
+from expectise import Expectations
+from expectise import shared
+from expectise import unordered
+from expectise.exceptions import ExpectationError
+from expectise.lib.session import session
+
+
+"""
+This example focuses on functions and methods called from child processes, e.g. the workers of a `ProcessPoolExecutor`:
+with `shared`, their calls are forwarded to the test process, checked against its `Expect` statements, and counted.
+"""
+
+WORKERS = 4
+
+
+def compute(i):
+    return SomeAPI.compute_sum(i, i)
+
+
+def square(i):
+    return some_functions.my_square(i)
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_shared_with_workers(method):
+    with Expectations():
+        # Workers perform calls in no particular order, hence `unordered`.
+        unordered(SomeAPI.compute_sum)
+        with shared(SomeAPI.compute_sum):
+            Expect(SomeAPI.compute_sum).to_receive(1, 1).and_return(2).times(50)
+            Expect(SomeAPI.compute_sum).to_receive(2, 2).and_return(4).times(50)
+            context = multiprocessing.get_context(method)
+            with ProcessPoolExecutor(max_workers=WORKERS, mp_context=context) as executor:
+                results = list(executor.map(compute, [1] * 50 + [2] * 50))
+            assert results == [2] * 50 + [4] * 50
+
+
+def test_shared_functions_and_errors():
+    with Expectations():
+        with shared(some_functions.my_square):
+            Expect(some_functions.my_square).to_receive(3).and_raise(ValueError("Negative"))
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                with pytest.raises(ValueError, match="Negative"):
+                    executor.submit(square, 3).result()
+                # Unexpected calls are reported to the child process, and the parent process reports missing calls.
+                with pytest.raises(ExpectationError, match="expected to be called 1 time"):
+                    executor.submit(square, 3).result()
+
+
+def test_shared_missing_calls():
+    # Calls are counted in the test process, whatever the process performing them.
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            with shared(SomeAPI.compute_sum):
+                Expect(SomeAPI.compute_sum).to_receive(1, 1).and_return(2).times(3)
+                context = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+                    assert list(executor.map(compute, [1, 1])) == [2, 2]
+
+
+def test_shared_stats():
+    # Calls forwarded by child processes are counted in the stats of the test process, as local calls are.
+    session.enable_stats()
+    try:
+        with Expectations():
+            with shared(SomeAPI.compute_sum):
+                Expect(SomeAPI.compute_sum).to_receive(1, 1).and_return(2).times(2)
+                context = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    assert list(executor.map(compute, [1, 1])) == [2, 2]
+
+        assert session.stats()["some_module.some_api.SomeAPI.compute_sum"]["calls"] == 2
+    finally:
+        session.disable_stats()
@@ -0,0 +1,70 @@
+import pytest
+from some_module import some_functions
+from some_module.some_api import SomeAPI
+
+from expectise import Expectations
+from expectise import mock
+from expectise import spy
+from expectise.exceptions import EnvironmentError
+
+
+"""
+This example focuses on spying on functions and methods marked as mocked: instead of describing their behavior with
+`Expect` statements, calls are forwarded to the original function or method, and recorded so that they can be checked
+afterwards. Only the last calls are kept in a fixed size buffer, so that spying on a function called many times does
+not consume more and more memory.
+"""
+
+
+def test_spy_function():
+    # Calls are forwarded to the original function, and recorded with their arguments.
+    with Expectations():
+        calls = spy(some_functions.my_sum)
+        assert some_functions.my_sum(1, 2) == 3
+        assert some_functions.my_sum(3, b=4) == 7
+
+        assert calls.call_count == 2
+        assert [(call.args, call.kwargs) for call in calls.calls] == [((1, 2), {}), ((3,), {"b": 4})]
+
+    # The spy is removed when tearing down, and the function is mocked again.
+    with pytest.raises(EnvironmentError):
+        some_functions.my_sum(1, 2)
+
+
+def test_spy_method():
+    # The instance bound to the method is not recorded, only the arguments explicitly passed.
+    with Expectations():
+        calls = spy(SomeAPI.update_attribute)
+        some_api = SomeAPI()
+        some_api.update_attribute("value")
+
+        assert some_api.my_attribute == "value"
+        assert calls.last_call.args == ("value",)
+
+
+def test_spy_ring_buffer():
+    # Only the last calls are kept, while all calls are counted.
+    with Expectations():
+        calls = spy(SomeAPI.compute_sum, capacity=10)
+        for i in range(1_000):
+            assert SomeAPI.compute_sum(i, 1) == i + 1
+
+        assert calls.call_count == 1_000
+        assert [call.args for call in calls.calls] == [(i, 1) for i in range(990, 1_000)]
+
+
+def test_spy_without_arguments():
+    # Arguments can be left out of the records, to count calls only.
+    with Expectations():
+        mock(some_functions.my_root)
+        calls = spy(some_functions.my_root, capture_arguments=False)
+        assert some_functions.my_root(4) == 2
+
+        assert calls.call_count == 1
+        assert calls.last_call.args is None
+
+
+def test_spy_unmarked_function():
+    # Only functions and methods marked as mocked can be spied on.
+    with pytest.raises(EnvironmentError):
+        spy(some_functions.my_subtraction)
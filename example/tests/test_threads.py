@@ -0,0 +1,78 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from some_module import some_functions
+from some_module.some_api import SomeAPI
+
+from expectise import Expect
+from expectise import Expectations
+from expectise.exceptions import ExpectationError
+
+
+"""
+This example focuses on functions and methods that are called concurrently, from a pool of threads.
+Each `Expect` statement describes exactly one call, whatever the thread performing it: concurrent calls never consume
+the same `Expect` statement twice, nor skip one.
+"""
+
+THREADS = 32
+CALLS_PER_THREAD = 500
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Switching between threads as often as possible, to maximize the interleaving of concurrent calls
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def call_concurrently(func, calls_per_thread=CALLS_PER_THREAD):
+    # Each thread calls the function several times, and collects what it returns or raises
+    def worker(_):
+        results = []
+        for _ in range(calls_per_thread):
+            try:
+                results.append(func())
+            except ExpectationError as error:
+                results.append(error)
+        return results
+
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        return [result for results in executor.map(worker, range(THREADS)) for result in results]
+
+
+def test_function_called_from_threads():
+    # Each call returns a distinct value, so that we can check that every `Expect` statement was consumed exactly once.
+    with Expectations():
+        for i in range(THREADS * CALLS_PER_THREAD):
+            Expect(some_functions.my_sum).and_return(i)
+
+        results = call_concurrently(lambda: some_functions.my_sum(1, 2))
+        assert sorted(results) == list(range(THREADS * CALLS_PER_THREAD))
+
+
+def test_method_called_from_threads_too_many_times():
+    # Once all `Expect` statements are consumed, every extra call raises an `ExpectationError`, whatever the thread.
+    with Expectations():
+        for i in range(THREADS * CALLS_PER_THREAD):
+            Expect(SomeAPI.get_something).to_receive("foo", "bar").and_return(i)
+
+        results = call_concurrently(lambda: SomeAPI.get_something("foo", "bar"), calls_per_thread=CALLS_PER_THREAD + 1)
+        errors = [result for result in results if isinstance(result, ExpectationError)]
+        assert len(errors) == THREADS
+        assert sorted(result for result in results if not isinstance(result, ExpectationError)) == list(
+            range(THREADS * CALLS_PER_THREAD)
+        )
+
+
+def test_function_called_n_times_from_threads():
+    # A single `Expect` statement describing many calls is claimed the right number of times too.
+    with Expectations():
+        Expect(some_functions.my_sum).and_return(3).times(THREADS * CALLS_PER_THREAD)
+
+        results = call_concurrently(lambda: some_functions.my_sum(1, 2), calls_per_thread=CALLS_PER_THREAD + 1)
+        assert len([result for result in results if isinstance(result, ExpectationError)]) == THREADS
+        assert len([result for result in results if result == 3]) == THREADS * CALLS_PER_THREAD
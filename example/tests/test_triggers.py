@@ -0,0 +1,94 @@
+import sys
+
+import pytest
+from some_module import some_functions
+
+from expectise import Expect
+from expectise import Expectations
+from expectise import mock_when
+from expectise.exceptions import EnvironmentError
+from expectise.lib.session import session
+from expectise.models.trigger import ConfigTrigger
+from expectise.models.trigger import SwitchTrigger
+
+
+"""
+This example focuses on triggers, deciding whether markers are activated: they are evaluated once, and their outcome is
+cached until `session.invalidate_triggers` is called. Besides environment variables, markers may depend on a function,
+on a configuration file, or on a process-wide switch.
+"""
+
+FLAGS = {"mocked": True}
+
+
+@mock_when(lambda: FLAGS["mocked"], lazy=True)
+def get_flagged():
+    return "original"
+
+
+@mock_when(SwitchTrigger(), lazy=True)
+def get_switched():
+    return "original"
+
+
+@mock_when(SwitchTrigger(), lazy=True)
+def get_switched_too():
+    return "original"
+
+
+def test_env_trigger_cached(monkeypatch):
+    # `lazy_debug` is only mocked in the `dev` environment, which is checked once and cached.
+    assert some_functions.lazy_debug() == "[DEBUG] This one is checked on every call"
+    monkeypatch.setenv("ENV", "dev")
+    assert some_functions.lazy_debug() == "[DEBUG] This one is checked on every call"
+    try:
+        # Once triggers are invalidated, the environment is checked again.
+        session.invalidate_triggers()
+        with Expectations():
+            Expect(some_functions.lazy_debug).to_return("Found it!")
+            assert some_functions.lazy_debug() == "Found it!"
+    finally:
+        monkeypatch.setenv("ENV", "test")
+        session.invalidate_triggers()
+
+
+def test_callable_trigger():
+    with Expectations():
+        Expect(get_flagged).to_return("mocked")
+        assert get_flagged() == "mocked"
+
+    FLAGS["mocked"] = False
+    try:
+        session.invalidate_triggers()
+        assert get_flagged() == "original"
+    finally:
+        FLAGS["mocked"] = True
+        session.invalidate_triggers()
+
+
+def test_config_trigger(tmp_path):
+    path = tmp_path / "settings.env"
+    trigger = ConfigTrigger(str(path), "MODE", "test")
+    assert not trigger.is_met()  # the file does not exist
+    path.write_text("# settings\nMODE = 'test'\nOTHER=1\n")
+    assert not trigger.is_met()  # cached
+    trigger.invalidate()
+    assert trigger.is_met()
+
+
+def test_switch():
+    # Markers depending on the process-wide switch are enabled or disabled all at once.
+    module = sys.modules[__name__]
+    assert get_switched() == "original" and get_switched_too() == "original"
+    session.switch(True)
+    try:
+        with pytest.raises(EnvironmentError):
+            module.get_switched()
+        with pytest.raises(EnvironmentError):
+            module.get_switched_too()
+        with Expectations():
+            Expect(get_switched).to_return("mocked")
+            assert module.get_switched() == "mocked"
+    finally:
+        session.switch(False)
+    assert module.get_switched() == "original" and module.get_switched_too() == "original"
@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from some_module.some_api import SomeAPI
+from some_module.some_async_api import SomeAsyncAPI
+
+from expectise import anything
+from expectise import Expect
+from expectise import Expectations
+from expectise import unordered
+from expectise.exceptions import ExpectationError
+
+
+"""
+This example focuses on calls received in any order, e.g. from `asyncio.gather` or thread pools: once `unordered` is
+used, each call is checked against the `Expect` statements expecting its arguments, wherever they are in the queue.
+"""
+
+
+def test_unordered_async_calls():
+    async def fetch_all(keys):
+        return await asyncio.gather(*(SomeAsyncAPI().fetch(key) for key in keys))
+
+    with Expectations():
+        unordered(SomeAsyncAPI.fetch)
+        for key in ["a", "b", "c"]:
+            Expect(SomeAsyncAPI.fetch).to_receive(key).and_return(key.upper())
+        assert asyncio.run(fetch_all(["c", "a", "b"])) == ["C", "A", "B"]
+
+
+def test_unordered_threads():
+    with Expectations():
+        unordered(SomeAPI.compute_sum)
+        for i in range(100):
+            Expect(SomeAPI.compute_sum).to_receive(i, i).and_return(2 * i)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda i: SomeAPI.compute_sum(i, i), reversed(range(100))))
+        assert results == [2 * i for i in reversed(range(100))]
+
+
+def test_unordered_counts_and_matchers():
+    with Expectations():
+        # Statements may be defined before switching to unordered mode as well.
+        Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return(3).times(2)
+        Expect(SomeAPI.compute_sum).to_receive(anything(), [0]).and_return(0)  # matched by trying the predicates
+        Expect(SomeAPI.compute_sum).to_return(-1)  # any arguments
+        unordered(SomeAPI.compute_sum)
+        assert SomeAPI.compute_sum(5, [0]) == 0
+        assert SomeAPI.compute_sum(1, 2) == 3
+        assert SomeAPI.compute_sum(7, 7) == -1
+        assert SomeAPI.compute_sum(1, 2) == 3
+        # Once claimed the number of times expected, statements are not expected anymore.
+        with pytest.raises(ExpectationError, match="unexpected arguments"):
+            SomeAPI.compute_sum(1, 2)
+
+    # Once exhausted, outputs leave the calls to the next statements expecting their arguments.
+    with Expectations():
+        unordered(SomeAPI.compute_sum)
+        Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return_each([3, 4])
+        Expect(SomeAPI.compute_sum).to_receive(anything(), 2).and_return_each([5])
+        Expect(SomeAPI.compute_sum).to_return(-1)
+        assert [SomeAPI.compute_sum(1, 2) for _ in range(4)] == [3, 4, 5, -1]
+
+        # Unexpected arguments are reported with a bounded representation, however large they are.
+        with pytest.raises(ExpectationError) as error:
+            SomeAPI.compute_sum(list(range(100_000)), 2)
+        assert len(str(error.value)) < 1000
+
+
+def test_unordered_missing_calls():
+    with pytest.raises(ExpectationError, match="still expected to be called 1 time"):
+        with Expectations():
+            unordered(SomeAPI.compute_sum)
+            Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return(3)
+            Expect(SomeAPI.compute_sum).to_receive(2, 1).and_return(3)
+            assert SomeAPI.compute_sum(2, 1) == 3
+
+    # Statements scanned with matchers are counted as well, once partly claimed.
+    with pytest.raises(ExpectationError, match="still expected to be called 2 time"):
+        with Expectations():
+            unordered(SomeAPI.compute_sum)
+            Expect(SomeAPI.compute_sum).to_receive(anything(), [0]).and_return(0).times(2)
+            Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return(3).at_least(2)
+            assert SomeAPI.compute_sum(5, [0]) == 0
+            assert SomeAPI.compute_sum(1, 2) == 3
+
+    # The unordered mode is removed with the session tear down.
+    with pytest.raises(ExpectationError, match="unexpected positional arguments"):
+        with Expectations():
+            Expect(SomeAPI.compute_sum).to_receive(1, 2).and_return(3)
+            Expect(SomeAPI.compute_sum).to_receive(2, 1).and_return(3)
+            SomeAPI.compute_sum(2, 1)
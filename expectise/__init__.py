@@ -1,6 +1,45 @@
-from .hooks import disable_mock
-from .hooks import mock
-from .hooks import mock_if
-from .hooks import tear_down
-from .lib.expect import Expect
-from .lib.expectations import Expectations
+from .hooks.mock_if import mock_if
+from .hooks.mock_if import mock_when
+from .lazy import lazy_attributes
+
+# Production code only uses `mock_if` and `mock_when`: everything else is imported on first access, so that importing
+# the package outside of tests does not load the mocking machinery.
+__all__ = [
+    "cassette",
+    "disable_mock",
+    "mock",
+    "mock_class",
+    "mock_if",
+    "mock_module",
+    "mock_when",
+    "shared",
+    "spy",
+    "tear_down",
+    "unordered",
+    "Expect",
+    "Expectations",
+    "anything",
+    "has_entries",
+    "instance_of",
+    "satisfies",
+]
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "cassette": ".hooks",
+        "disable_mock": ".hooks",
+        "mock": ".hooks",
+        "mock_class": ".hooks",
+        "mock_module": ".hooks",
+        "shared": ".hooks",
+        "spy": ".hooks",
+        "tear_down": ".hooks",
+        "unordered": ".hooks",
+        "Expect": ".lib.expect",
+        "Expectations": ".lib.expectations",
+        "anything": ".lib.matchers",
+        "has_entries": ".lib.matchers",
+        "instance_of": ".lib.matchers",
+        "satisfies": ".lib.matchers",
+    },
+)
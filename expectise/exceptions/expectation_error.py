@@ -1,6 +1,36 @@
+from typing import Any
+
+from expectise.utils.diff import Diff
+from expectise.utils.diff import REPR
+
+
 class ExpectationError(Exception):
     """
     Error describing a mismatch between mock expectations and actual calls:
     * more or less calls than expected,
     * arguments passed to the mock do not match expectations.
+
+    When given the expected and actual objects, the error message is completed with their diff, or with a bounded
+    representation of the actual object when nothing in particular was expected. They are only rendered when the error
+    is displayed, and cached afterwards: errors that are caught and never displayed are cheap.
     """
+
+    def __init__(self, message: str, expected: Any = None, actual: Any = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.expected = expected
+        self.actual = actual
+        self._rendered = None
+
+    def __str__(self) -> str:
+        if self._rendered is None:
+            if self.expected is None and self.actual is None:
+                self._rendered = self.message
+            elif self.expected is None:
+                self._rendered = self.message + REPR.repr(self.actual)
+            else:
+                self._rendered = self.message + Diff.print(self.expected, self.actual)
+        return self._rendered
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({str(self)!r})"
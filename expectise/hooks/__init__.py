@@ -1,4 +1,32 @@
-from .disable_mock import disable_mock
-from .mock import mock
+from ..lazy import lazy_attributes
 from .mock_if import mock_if
-from .tear_down import tear_down
+from .mock_if import mock_when
+
+# Only `mock_if` and `mock_when` are used by production code, other hooks are imported on first access
+__all__ = [
+    "cassette",
+    "disable_mock",
+    "mock",
+    "mock_class",
+    "mock_if",
+    "mock_module",
+    "mock_when",
+    "shared",
+    "spy",
+    "tear_down",
+    "unordered",
+]
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "cassette": ".cassette",
+        "disable_mock": ".disable_mock",
+        "mock": ".mock",
+        "mock_class": ".mock",
+        "mock_module": ".mock",
+        "shared": ".shared",
+        "spy": ".spy",
+        "tear_down": ".tear_down",
+        "unordered": ".unordered",
+    },
+)
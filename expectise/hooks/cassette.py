@@ -0,0 +1,29 @@
+import os
+from typing import Callable
+
+from expectise.exceptions import EnvironmentError
+from expectise.lib.cassette import Cassette
+from expectise.lib.session import session
+
+
+def cassette(path: str, *refs: Callable, record: bool | None = None) -> Cassette:
+    """
+    Record calls to functions or class methods marked as mocked into a cassette file, or replay them from it, within
+    the returned context manager.
+    * In record mode, calls are forwarded to the original functions or methods, and recorded with their outcome.
+    * In replay mode, recorded calls are expected as if described by `Expect` statements, and read lazily from the
+    memory-mapped file: only the records consumed by the test are read.
+    * Unless `record` is set, calls are recorded if the cassette file does not exist yet, and replayed otherwise.
+
+    Cassettes are pickle files: only replay cassettes from trusted sources.
+    """
+    markers = [session.get_marker(ref) for ref in refs]
+    for marker in markers:
+        if not marker.enabled:
+            raise EnvironmentError(
+                f"The marker for `{marker.kallable.id}` is not enabled, so using it with a cassette is not allowed. "
+                "Check that the right environment variable are set."
+            )
+    if record is None:
+        record = not os.path.exists(path)
+    return Cassette(path, markers, record=record)
@@ -1,10 +1,19 @@
+from importlib import import_module
+from types import FunctionType
+from types import ModuleType
 from typing import Callable
+from typing import Iterable
+from typing import Type
 
+from expectise.exceptions import EnvironmentError
 from expectise.lib.session import session
 from expectise.models import Lifespan
+from expectise.models.decoration import Decoration
 from expectise.models.kallable import Kallable
 from expectise.models.trigger import AlwaysTrigger
 
+TRIGGER = AlwaysTrigger()  # shared by all temporary markers
+
 
 def mock(ref: Callable) -> None:
     """
@@ -13,5 +22,68 @@ def mock(ref: Callable) -> None:
     * A temporary marker is automatically removed when the Expectise session is torn down.
     """
     kallable = Kallable(ref)  # without any dynamic imports, no easy way to know the owning class here, if applicable
-    marker = session.mark_method(kallable, trigger=AlwaysTrigger(), lifespan=Lifespan.TEMPORARY)
+    marker = session.mark_method(kallable, trigger=TRIGGER, lifespan=Lifespan.TEMPORARY)
     marker.set_up()
+
+
+def mock_class(klass: Type, include: Iterable[str] | None = None, exclude: Iterable[str] = ()) -> list[str]:
+    """
+    Mark the methods, class methods, static methods and properties of a class as temporarily mocked, in a single pass.
+    * Only attributes defined by the class itself are marked, not inherited ones. Special methods such as `__init__`
+    are left out, unless listed in `include`.
+    * `include` restricts marking to the given attribute names, and `exclude` leaves out the given attribute names.
+    * Methods marked already, with `mock_if` for instance, are left untouched, even when their marker is disabled.
+    * Temporary markers are automatically removed when the Expectise session is torn down.
+
+    Return the names of the attributes marked.
+    """
+    module = import_module(klass.__module__)
+    refs = mockable(vars(klass), include=include, exclude=exclude)
+    kallables = unmarked(Kallable(ref, klass=klass, module=module) for ref in refs)
+    session.mark_methods(kallables, trigger=TRIGGER, lifespan=Lifespan.TEMPORARY)
+    return [kallable.name for kallable in kallables]
+
+
+def mock_module(module: ModuleType, include: Iterable[str] | None = None, exclude: Iterable[str] = ()) -> list[str]:
+    """
+    Mark the functions of a module as temporarily mocked, in a single pass.
+    * Only functions defined by the module itself are marked, not imported ones.
+    * `include` restricts marking to the given function names, and `exclude` leaves out the given function names.
+    * Functions marked already, with `mock_if` for instance, are left untouched, even when their marker is disabled.
+    * Temporary markers are automatically removed when the Expectise session is torn down.
+
+    Return the names of the functions marked.
+    """
+    refs = [ref for ref in mockable(vars(module), include, exclude) if ref.__module__ == module.__name__]
+    kallables = unmarked(Kallable(ref, module=module) for ref in refs)
+    session.mark_methods(kallables, trigger=TRIGGER, lifespan=Lifespan.TEMPORARY)
+    return [kallable.name for kallable in kallables]
+
+
+def unmarked(kallables: Iterable[Kallable]) -> list[Kallable]:
+    """
+    Leave out functions and methods that have a marker in the session already: once disabled, with `disable_mock` for
+    instance, a marker restores the original function, that would otherwise be marked again.
+    """
+    return [kallable for kallable in kallables if kallable.id not in session.markers]
+
+
+def mockable(namespace: dict, include: Iterable[str] | None, exclude: Iterable[str]) -> list[Callable]:
+    """
+    List the functions, class methods, static methods and properties of a namespace that can be marked as mocked,
+    raising an error if some names explicitly included cannot be.
+    """
+    exclude = set(exclude)
+    names = [name for name in namespace if not name.startswith("__")] if include is None else list(include)
+    refs = []
+    for name in names:
+        if name in exclude:
+            continue
+        ref = namespace.get(name)
+        function = Decoration(ref).strip(ref)
+        # aliases are left out, as markers restore functions and methods under their own name
+        if isinstance(function, FunctionType) and function.__name__ == name and not hasattr(function, "_original_id"):
+            refs.append(ref)
+        elif include is not None:
+            raise EnvironmentError(f"`{name}` is not a function or method that can be marked as mocked.")
+    return refs
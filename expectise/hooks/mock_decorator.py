@@ -0,0 +1,82 @@
+from typing import Callable
+from typing import Type
+
+from expectise.lib.marker import Marker
+from expectise.lib.session import session
+from expectise.models import Lifespan
+from expectise.models.kallable import Kallable
+from expectise.models.trigger import Trigger
+
+
+class MockDecorator:
+    __slots__ = ("ref", "trigger", "klass", "_marker", "__weakref__")
+
+    def __init__(self, ref: Callable, trigger: Trigger) -> None:
+        """
+        Decorator class, that takes as input the function or class method to be mocked:
+        * if the environment conditions are met, the function or class method is effectively marked as mocked,
+        * if not, the function or class method is left unchanged.
+
+        Applying the decorator only stores the function or class method: its metadata is resolved and its marker is
+        registered in the session when first needed, so that importing thousands of decorated functions stays cheap.
+        """
+        self.ref = ref
+        self.trigger = trigger
+        self.klass = None
+        self._marker = None
+
+    @property
+    def marker(self) -> Marker:
+        """Get the marker of the function or class method, registering it in the session on first access."""
+        if self._marker is None:
+            kallable = Kallable(self.ref, klass=self.klass)
+            self._marker = session.mark_method(kallable, trigger=self.trigger, lifespan=Lifespan.PERMANENT)
+        return self._marker
+
+    @property
+    def _original_id(self) -> str:
+        """Identifier of the function or class method, used to find its marker in the session."""
+        return self.marker.kallable.id
+
+    def __set_name__(self, owner: Type, name: str) -> None:
+        """
+        Applies to class methods only.
+        At interpretation time when the MockDecorator object is created, the surrounding class is not created yet.
+        As soon as it is, this `__set_name__` method is called, which gives us a way to know and record the class
+        that owns the method to be mocked.
+        """
+        self.klass = owner
+
+    def __get__(self, instance: object, owner: Type) -> Callable:
+        """
+        Applies to class methods only.
+        The marker is set up when the method is first accessed, which replaces this decorator in the class with the
+        placeholder, or with the original method if the environment conditions are not met. The method is then looked
+        up again, to be bound as usual.
+        """
+        marker = self.marker
+        marker.set_up()
+        return getattr(owner if instance is None else instance, marker.kallable.name)
+
+    def __repr__(self) -> str:
+        return self.ref.__repr__()
+
+    def __call__(self, *args, **kwargs) -> Callable:
+        """
+        Applies to standalone functions only.
+        Function markers cannot be enabled at interpretation time like method markers can.
+        Such markers are enabled later, when `Expect` statements are used to define the mocked behavior.
+        If the function is called without using an `Expect` statement to define its mocked behavior,
+        we need to raise an error, unless the marker was explicitly disabled.
+        """
+        marker = self.marker
+        # For standalone functions decorated with `mock_if`, when environment conditions are not met,
+        # the original function should be called. The outcome of the trigger is cached, so that further calls
+        # only pay for checking it.
+        if not marker.enabled and not marker.trigger.is_met():
+            return self.ref(*args, **kwargs)
+        marker.set_up()
+
+        # If the trigger is met, the function is called for the first time without any `Expect` statement, so it is
+        # forwarded to the placeholder, that raises an error (when awaited, for coroutine functions).
+        return marker.placeholder(*args, **kwargs)
@@ -1,20 +1,28 @@
-from typing import Callable
-from typing import Type
-
-from expectise.exceptions import EnvironmentError
-from expectise.lib.session import session
-from expectise.models import Lifespan
-from expectise.models.kallable import Kallable
+from expectise.models.trigger import CallableTrigger
 from expectise.models.trigger import EnvTrigger
+from expectise.models.trigger import Trigger
+
+# This module is imported by production code: `typing` and the mocking machinery are only imported when needed
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable
 
+TRIGGERS = {}  # triggers are shared by all decorators with the same environment conditions
 
-def mock_if(env_key: str, env_val: str) -> Type:
+
+def mock_if(env_key: str, env_val: str, lazy: bool = False) -> "Callable":
     """
     Decorator to identify which functions or class methods should be mocked permanently, depending on the environment.
     * The marker is activated only in case the environment conditions are met.
     * Once marked, a function or method cannot be called without using an `Expect` statement to define its behavior.
     * A permanent marker is not removed when the Expectise session is torn down (but related mocks are reset).
 
+    The environment conditions are checked once, when the decorator is applied: if they are not met, the original
+    function or method is returned untouched and no marker is registered, so that production code pays no overhead.
+    Passing `lazy=True` registers the marker regardless, and checks the environment conditions again when the marker
+    is set up, once triggers are invalidated with `session.invalidate_triggers` (typically for environments that are
+    configured after the decorated code is imported).
+
     Example:
 
         mock_if("ENV", "test")
@@ -22,56 +30,35 @@ def mock_if(env_key: str, env_val: str) -> Type:
             pass
 
     """
+    if (trigger := TRIGGERS.get((env_key, env_val))) is None:
+        trigger = TRIGGERS[(env_key, env_val)] = EnvTrigger(env_key, env_val)
+    return mock_when(trigger, lazy=lazy)
+
+
+def mock_when(trigger: "Trigger | Callable[[], bool]", lazy: bool = False) -> "Callable":
+    """
+    Decorator to identify which functions or class methods should be mocked permanently, depending on a trigger, as
+    `mock_if` does for environment variables. The trigger may be:
+    * a function returning whether the marker should be activated, called without arguments,
+    * a `Trigger` from `expectise.models.trigger`, e.g. `ConfigTrigger` to read a configuration file, or `SwitchTrigger`
+    to depend on the process-wide switch flipped with `session.switch`, along with `lazy=True`.
+
+    Example:
+
+        mock_when(lambda: settings.TESTING)
+        def foo(...)
+            pass
+
+    """
+    if not isinstance(trigger, Trigger):
+        trigger = CallableTrigger(trigger)
+
+    def decorator(ref: "Callable") -> "Callable":
+        """Mark the function or class method as mocked, or return it untouched if the trigger is not met."""
+        if not lazy and not trigger.is_met():
+            return ref
+        from .mock_decorator import MockDecorator
+
+        return MockDecorator(ref, trigger)
 
-    class MockDecorator:
-        def __init__(self, ref: Callable) -> None:
-            """
-            Decorator class, that takes as input the function or class method to be mocked:
-            * if the environment conditions are met, the function or class method is effectively marked as mocked,
-            * if not, the function or class method is left unchanged.
-            """
-            self.kallable = Kallable(ref)
-            self._original_id = self.kallable.id
-            self.marker = session.mark_method(
-                self.kallable,
-                trigger=EnvTrigger(env_key, env_val),
-                lifespan=Lifespan.PERMANENT,
-            )
-
-        def __set_name__(self, owner: Type, name: str) -> None:
-            """
-            Applies to class methods only.
-            At interpretation time when the MockDecorator object is created, the surrounding class is not created yet.
-            As soon as it is, this `__set_name__` method is called, which gives us a way to know and record the class
-            that owns the method to be mocked.
-            """
-            self.kallable.klass = owner
-            self.marker.set_up()
-
-        def __repr__(self) -> str:
-            return self.kallable.ref.__repr__()
-
-        def __call__(self, *args, **kwargs) -> Callable:
-            """
-            Applies to standalone functions only.
-            Function markers cannot be enabled at interpretation time like method markers can.
-            Such markers are enabled later, when `Expect` statements are used to define the mocked behavior.
-            If the function is called without using an `Expect` statement to define its mocked behavior,
-            we need to raise an error, unless the marker was explicitly disabled.
-            """
-            self.marker.set_up()
-            # For standalone functions decorated with `mock_if`, when environment conditions are not met,
-            # the original function should be called. This block will be executed only once, and further calls
-            # to the function will
-            if not self.marker.enabled:
-                return self.kallable.ref(*args, **kwargs)
-
-            # If the trigger is met, this block should never be reached:
-            # * the marker is either enabled, in which case the function override is already applied,
-            # * or the marker is explicitly disabled, in which case the original function should be called.
-            raise EnvironmentError(
-                f"Callable `{self.kallable.id}` is marked as mocked, "
-                "and will raise errors if called without using an `Expect` statement to define its mocked behavior."
-            )
-
-    return MockDecorator
+    return decorator
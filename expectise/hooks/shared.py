@@ -0,0 +1,27 @@
+from typing import Callable
+
+from expectise.exceptions import EnvironmentError
+from expectise.lib.session import session
+from expectise.lib.shared import Shared
+
+
+def shared(*refs: Callable) -> Shared:
+    """
+    Share the expectations of functions or class methods marked as mocked with child processes, e.g. the workers of a
+    `multiprocessing.Pool` or of a `ProcessPoolExecutor`, within the returned context manager.
+    * Calls performed by child processes are forwarded to the current process, checked against its `Expect` statements
+    and counted, so that missing or unexpected calls are reported when tearing down, as usual.
+    * Forked child processes forward calls as soon as they are created. Spawned child processes import the functions or
+    methods again, so only the ones marked with `mock_if` forward their calls.
+    * Arguments, return values and errors are pickled to be exchanged. Coroutine functions cannot be shared.
+    """
+    markers = [session.get_marker(ref) for ref in refs]
+    for marker in markers:
+        if not marker.enabled:
+            raise EnvironmentError(
+                f"The marker for `{marker.kallable.id}` is not enabled, so sharing it with child processes is not "
+                "allowed. Check that the right environment variable are set."
+            )
+        if marker.kallable.is_coroutine:
+            raise EnvironmentError(f"`{marker.kallable.id}` is a coroutine function, that cannot be shared.")
+    return Shared(markers)
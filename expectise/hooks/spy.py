@@ -0,0 +1,22 @@
+from typing import Callable
+
+from expectise.exceptions import EnvironmentError
+from expectise.lib.session import session
+from expectise.lib.spy import Spy
+
+
+def spy(ref: Callable, capacity: int = 1024, capture_arguments: bool = True) -> Spy:
+    """
+    Spy on a function or class method that is marked as mocked: calls are forwarded to the original function or method,
+    and recorded by the returned `Spy` object, so that they can be checked afterwards.
+    * Only the last `capacity` calls are recorded, so that memory does not grow with the number of calls.
+    * Call arguments are recorded only if `capture_arguments` is set.
+    * The spy is removed when the Expectise session is torn down.
+    """
+    marker = session.get_marker(ref)
+    if not marker.enabled:
+        raise EnvironmentError(
+            f"The marker for `{marker.kallable.id}` is not enabled, so spying on it is not allowed. "
+            "Check that the right environment variable are set."
+        )
+    return marker.spy(capacity=capacity, capture_arguments=capture_arguments)
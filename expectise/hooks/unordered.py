@@ -0,0 +1,25 @@
+from typing import Callable
+
+from expectise.exceptions import EnvironmentError
+from expectise.lib.session import session
+
+
+def unordered(*refs: Callable) -> None:
+    """
+    Let functions or class methods marked as mocked be called in any order with regard to their `Expect` statements:
+    each call is checked against the statements expecting its arguments, wherever they are in the queue. This is
+    useful for calls issued concurrently, e.g. with `asyncio.gather` or thread pools.
+    * Statements expecting hashable arguments are indexed by arguments, so that each call finds its own in constant
+    time, whatever the number of statements. Statements with matchers, unhashable arguments, or no `to_receive`
+    are tried in turn when no indexed statement expects the arguments of the call.
+    * Calls are still expected to be received the number of times described by `Expect` statements.
+    * The unordered mode is removed when the Expectise session is torn down.
+    """
+    for ref in refs:
+        marker = session.get_marker(ref)
+        if not marker.enabled:
+            raise EnvironmentError(
+                f"The marker for `{marker.kallable.id}` is not enabled, so calling it in any order is not allowed. "
+                "Check that the right environment variable are set."
+            )
+        marker.mock.set_unordered(True)
@@ -0,0 +1,22 @@
+import sys
+
+
+def lazy_attributes(package: str, attributes: dict[str, str]) -> tuple:
+    """
+    Build the `__getattr__` and `__dir__` functions of a package (PEP 562), so that the given attributes are only
+    imported from their module when first accessed, and cached in the package afterwards.
+    """
+    namespace = sys.modules[package].__dict__
+
+    def __getattr__(name: str):
+        if (module_name := attributes.get(name)) is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        from importlib import import_module
+
+        value = namespace[name] = getattr(import_module(module_name, package), name)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *attributes})
+
+    return __getattr__, __dir__
@@ -0,0 +1,199 @@
+import mmap
+import os
+import pickle
+import struct
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Iterator
+
+from expectise.exceptions import EnvironmentError
+from expectise.models.kallable import Kallable
+
+MAGIC = b"EXPECTISE-CASSETTE-1\n"
+# Position of the index and of the directory, followed by the magic bytes again, at the very end of the file
+FOOTER = struct.Struct("<QQ")
+# Position and length of a record, in the index
+ENTRY = struct.Struct("<QQ")
+
+
+class CassetteWriter:
+    """
+    Writer of a cassette file, recording calls to mocked functions or methods that are forwarded to the originals.
+
+    Records are pickled `(args, kwargs, is_error, value)` tuples, appended to the file as calls are received. Once
+    closed, the file ends with:
+    * an index of the position and length of each record, grouped by function or method, in the order of the calls,
+    * a directory giving the range of entries of the index for each function or method, by identifier,
+    * a footer giving the position of the index and of the directory.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.entries = {}  # positions and lengths of the records of each function or method, by identifier
+        self._lock = Lock()  # calls may be recorded concurrently
+
+    def record(self, kallable_id: str, args: tuple[Any], kwargs: dict[Any, Any], is_error: bool, value: Any) -> None:
+        """Append the record of a call to the file."""
+        try:
+            data = pickle.dumps((args, kwargs, is_error, value), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as error:
+            raise EnvironmentError(f"Call to `{kallable_id}` cannot be recorded, as it cannot be pickled: {error}")
+        with self._lock:
+            self.entries.setdefault(kallable_id, []).append((self.file.tell(), len(data)))
+            self.file.write(data)
+
+    def wrap(self, kallable: Kallable, func: Callable) -> Callable:
+        """Wrap the original function, to record the outcome of each call after forwarding it."""
+        record = self.record
+        kallable_id = kallable.id
+        offset = kallable.args_offset
+
+        if kallable.is_coroutine:
+
+            async def recorded(*args, **kwargs):
+                try:
+                    value = await func(*args, **kwargs)
+                except Exception as error:
+                    record(kallable_id, args[offset:] if offset else args, kwargs, True, error)
+                    raise
+                record(kallable_id, args[offset:] if offset else args, kwargs, False, value)
+                return value
+
+        else:
+
+            def recorded(*args, **kwargs):
+                try:
+                    value = func(*args, **kwargs)
+                except Exception as error:
+                    record(kallable_id, args[offset:] if offset else args, kwargs, True, error)
+                    raise
+                record(kallable_id, args[offset:] if offset else args, kwargs, False, value)
+                return value
+
+        recorded._original_id = kallable.id
+        return kallable.decoration.add(recorded)
+
+    def close(self) -> None:
+        """Write the index, the directory and the footer, and close the file."""
+        with self._lock:
+            index_position = self.file.tell()
+            directory = {}
+            first = 0
+            for kallable_id, entries in self.entries.items():
+                directory[kallable_id] = (first, len(entries))
+                first += len(entries)
+                self.file.write(b"".join(ENTRY.pack(position, length) for position, length in entries))
+            directory_position = self.file.tell()
+            self.file.write(pickle.dumps(directory, protocol=pickle.HIGHEST_PROTOCOL))
+            self.file.write(FOOTER.pack(index_position, directory_position) + MAGIC)
+            self.file.close()
+
+    def discard(self) -> None:
+        """Close and remove the file, whose records are incomplete."""
+        with self._lock:
+            self.file.close()
+            os.remove(self.path)
+
+
+class CassetteReader:
+    """
+    Reader of a cassette file, memory-mapped so that only the records consumed are read, whatever the size of the file.
+    Records are only unpickled when the calls they describe are received.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(MAGIC) * 2 + FOOTER.size:
+                raise EnvironmentError(f"`{path}` is not a complete cassette file.")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        footer = len(self.map) - len(MAGIC) - FOOTER.size
+        if self.map[: len(MAGIC)] != MAGIC or self.map[footer + FOOTER.size :] != MAGIC:
+            raise EnvironmentError(f"`{path}` is not a complete cassette file.")
+        self.index_position, directory_position = FOOTER.unpack_from(self.map, footer)
+        self.directory = pickle.loads(self.map[directory_position:footer])
+
+    def track(self, kallable_id: str) -> "Track":
+        """Get the records of the calls to a function or method, empty if none was recorded."""
+        first, count = self.directory.get(kallable_id, (0, 0))
+        return Track(self, first, count)
+
+    def read(self, entry: int) -> tuple[tuple[Any], dict[Any, Any], bool, Any]:
+        """Read and unpickle the record of the given entry of the index."""
+        if self.map.closed:
+            raise EnvironmentError(f"`{self.path}` is closed: recorded calls are not replayed once the cassette exits.")
+        position, length = ENTRY.unpack_from(self.map, self.index_position + entry * ENTRY.size)
+        return pickle.loads(self.map[position : position + length])
+
+    def close(self) -> None:
+        """Unmap the file, once the records are not replayed anymore."""
+        self.map.close()
+
+
+class Track:
+    """Iterator over the records of the calls to a function or method, read one at a time, in the order of the calls."""
+
+    __slots__ = ("reader", "next_entry", "end")
+
+    def __init__(self, reader: CassetteReader, first: int, count: int) -> None:
+        self.reader = reader
+        self.next_entry = first
+        self.end = first + count
+
+    def __iter__(self) -> Iterator[tuple[tuple[Any], dict[Any, Any], bool, Any]]:
+        return self
+
+    def __next__(self) -> tuple[tuple[Any], dict[Any, Any], bool, Any]:
+        if self.next_entry >= self.end:
+            raise StopIteration
+        entry = self.next_entry
+        self.next_entry += 1
+        return self.reader.read(entry)
+
+    def __length_hint__(self) -> int:
+        """Number of records left, counted without reading them."""
+        return self.end - self.next_entry
+
+
+class Cassette:
+    """
+    Context manager recording calls to mocked functions or methods into a cassette file, or replaying them from it.
+    * In record mode, calls are forwarded to the original functions or methods, and their arguments and outcomes are
+    recorded. The cassette file is complete once the context manager exits, and removed if it exits with an error.
+    * In replay mode, recorded calls are expected, as if described by `Expect` statements: each call is checked
+    against the arguments recorded, and returns the value or raises the error recorded. Recorded calls are queued after
+    the ones described by `Expect` statements, and read from the file only when needed, until the context manager
+    exits. Recorded calls that were not replayed are reported as missing calls when tearing down.
+    """
+
+    def __init__(self, path: str, markers: list, record: bool) -> None:
+        self.path = path
+        self.markers = markers
+        self.record = record
+        self.writer = None
+        self.reader = None
+
+    def __enter__(self) -> "Cassette":
+        if self.record:
+            self.writer = CassetteWriter(self.path)
+            for marker in self.markers:
+                marker.record(self.writer)
+        else:
+            self.reader = CassetteReader(self.path)
+            for marker in self.markers:
+                marker.mock.replay(self.reader.track(marker.kallable.id))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        for marker in self.markers:
+            marker.set_up()  # calls are not recorded nor replayed anymore once the context manager exits
+        if not self.record:
+            self.reader.close()
+        elif exc_type is not None:
+            self.writer.discard()  # records are incomplete, as the calls were interrupted by the error
+        else:
+            self.writer.close()
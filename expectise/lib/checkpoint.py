@@ -0,0 +1,35 @@
+from .marker import Marker
+
+
+class Checkpoint:
+    """
+    Checkpoint of the session, that the session can be restored to, typically at the end of each test of a module
+    sharing a heavy mocking configuration set up once by a module-scoped fixture.
+
+    It holds:
+    * the markers of the session when the checkpoint was taken, to roll back markers created or replaced since then,
+    * the identifiers of the markers explicitly disabled back then, to disable them again,
+    * the spies and recorders standing for functions and methods back then, to set them back,
+    * the markers touched before the checkpoint was taken, that are only torn down with the session itself.
+    """
+
+    __slots__ = ("markers", "disabled", "wrappers", "touched")
+
+    def __init__(self, markers: dict[str, Marker], touched: dict[str, Marker]) -> None:
+        self.markers = dict(markers)
+        self.disabled = {kallable_id for kallable_id, marker in markers.items() if marker.disabled}
+        self.wrappers = {
+            kallable_id: wrapper for kallable_id, marker in markers.items() if (wrapper := marker.wrapper) is not None
+        }
+        self.touched = touched
+
+    def reset(self, marker: Marker) -> None:
+        """
+        Reset a marker of the checkpoint, disable it again if it was disabled when the checkpoint was taken, and set
+        back the spy or recorder that stood for its function or method back then, if any.
+        """
+        marker.reset()
+        if marker.kallable.id in self.disabled:
+            marker.disable(mark_disabled=True)
+        if (wrapper := self.wrappers.get(marker.kallable.id)) is not None:
+            marker.wrap(wrapper)
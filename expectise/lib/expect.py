@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from time import perf_counter_ns
 from typing import Any
 from typing import Callable
+from typing import Iterable
 
 from .session import session
 from expectise.exceptions import EnvironmentError
@@ -14,17 +16,22 @@ class Expect(object):
     It can be used to:
     * describe the arguments that the function or method should be called with;
     * describe the output that the function or method should return;
-    * describe the error that the function or method should raise.
+    * describe the error that the function or method should raise;
+    * describe the number of times the function or method should be called that way.
 
     Example:
     ```python
     Expect(SomeAPI.get_something).to_receive("foo", "bar").and_return(False)
     Expect(SomeAPI.get_something).to_raise(ValueError("My error"))
+    Expect(SomeAPI.get_something).to_receive("foo", "bar").and_return(False).times(3)
     ```
     """
 
+    __slots__ = ("kallable", "mock")
+
     def __init__(self, mock_ref: Callable) -> None:
         """Initialize an Expect instance with the function or method to be mocked."""
+        start = perf_counter_ns() if session.marker_stats is not None else 0
         marker = session.get_marker(mock_ref)
         if not marker.enabled:
             raise EnvironmentError(
@@ -33,12 +40,11 @@ class Expect(object):
             )
 
         self.kallable = marker.kallable
+        self.mock = marker.mock
         self.mock.new()
-
-    @property
-    def mock(self):
-        """Return the Mock object associated with the function or method."""
-        return session.markers[self.kallable.id].mock
+        if (stats := self.mock.stats) is not None:
+            stats.statements += 1
+            stats.set_up_ns += perf_counter_ns() - start
 
     def to_receive(self, *args, **kwargs) -> Expect:
         """Describe the arguments that the function or method should be called with."""
@@ -54,6 +60,35 @@ class Expect(object):
         """Alias for `to_return`."""
         return self.to_return(output)
 
+    def to_return_each(self, outputs: Iterable[Any]) -> Expect:
+        """
+        Describe the outputs that consecutive calls to the function or method should return.
+        Outputs are pulled from the iterable one at a time, when calls are received: generators can be used to produce
+        large sequences of outputs lazily. Unless a number of calls is specified, calls are expected until the outputs
+        are exhausted.
+        """
+        self.mock.add_return_values(outputs)
+        return self
+
+    def and_return_each(self, outputs: Iterable[Any]) -> Expect:
+        """Alias for `to_return_each`."""
+        return self.to_return_each(outputs)
+
+    def times(self, n: int) -> Expect:
+        """Describe the number of times the function or method should be called, with the same behavior."""
+        self.mock.set_call_count(n, n)
+        return self
+
+    def at_least(self, n: int) -> Expect:
+        """Describe the minimum number of times the function or method should be called, with the same behavior."""
+        self.mock.set_call_count(n, None)
+        return self
+
+    def any_number_of_times(self) -> Expect:
+        """Describe a function or method that may be called any number of times, with the same behavior."""
+        self.mock.set_call_count(0, None)
+        return self
+
     def to_raise(self, error: Exception) -> Expect:
         """Describe the error that the function or method should raise."""
         self.mock.add_execution_errors(error)
@@ -1,9 +1,20 @@
+from typing import Callable
+
+from .cassette import CassetteWriter
 from .mock import Mock
+from .shared import forwarder
+from .shared import remote_ids
+from .spy import Spy
 from expectise.exceptions import EnvironmentError
 from expectise.models import Lifespan
 from expectise.models.kallable import Kallable
 from expectise.models.trigger import Trigger
 
+NOT_EXPECTED = (
+    "Callable `{}` is marked as mocked, "
+    "and will raise errors if called without using an `Expect` statement to define its mocked behavior."
+)
+
 
 class Marker:
     """
@@ -18,6 +29,8 @@ class Marker:
     Once a marker is set on a function or method, its behavior can be described using `Expect` statements.
     """
 
+    __slots__ = ("kallable", "mock", "trigger", "lifespan", "enabled", "disabled", "wrapper", "_placeholder")
+
     def __init__(self, kallable: Kallable, trigger: Trigger, lifespan: Lifespan) -> None:
         self.kallable = kallable
         self.mock = Mock(kallable)
@@ -25,18 +38,40 @@ class Marker:
         self.lifespan = lifespan
         self.enabled = False  # toggled everytime the marker is enabled or disabled
         self.disabled = False  # toggled when a mock is explicitly disabled
+        self.wrapper = None  # spy or recorder standing for the function or method until the marker is reset
+        self._placeholder = None
 
     @property
     def placeholder(self):
         """
         Return a placeholder function that will replace the mocked function or method under when the trigger is met.
+        The placeholder is built once for the lifetime of the marker.
+        """
+        if self._placeholder is None:
+            self._placeholder = self._build_placeholder()
+        return self._placeholder
+
+    def _build_placeholder(self):
+        """
+        Build the placeholder function, that raises an error whenever called.
+        For coroutine functions, the placeholder is a coroutine function too, raising the error when awaited.
+        In child processes of a process sharing its expectations, the placeholder forwards calls to the parent process.
         """
+        kallable = self.kallable
 
-        def func(*args, **kwargs):
-            raise EnvironmentError(
-                f"Callable `{self.kallable.id}` is marked as mocked, "
-                "and will raise errors if called without using an `Expect` statement to define its mocked behavior."
-            )
+        if kallable.id in remote_ids():
+            # in a child process spawned while expectations are shared, calls are forwarded to the parent process
+            func = forwarder(kallable)
+
+        elif kallable.is_coroutine:
+
+            async def func(*args, **kwargs):
+                raise EnvironmentError(NOT_EXPECTED.format(kallable.id))
+
+        else:
+
+            def func(*args, **kwargs):
+                raise EnvironmentError(NOT_EXPECTED.format(kallable.id))
 
         func._original_id = self.kallable.id
         return self.kallable.decoration.add(func)
@@ -47,17 +82,57 @@ class Marker:
         in order to forbid calls to the original function or method.
         """
         if self.trigger.is_met():
-            setattr(self.kallable.owner, self.kallable.name, self.placeholder)
-            self.enabled = True
+            self.enable()
         else:
             self.disable()
 
+    def enable(self):
+        """Replace the mocked function or method with its placeholder, regardless of the trigger."""
+        self.kallable.assign(self.toggle(True))
+
     def disable(self, mark_disabled: bool = False):
         """Restore the original function or method and remove any mocking logic."""
-        setattr(self.kallable.owner, self.kallable.name, self.kallable.ref)
-        self.enabled = False
+        self.kallable.assign(self.toggle(False))
         self.disabled = mark_disabled
 
+    def toggle(self, enabled: bool) -> Callable:
+        """
+        Enable or disable the marker, and return the object that should stand for the function or method accordingly,
+        so that the functions of several markers can be set in a single batch.
+        """
+        self.mock.installed = False
+        self.enabled = enabled
+        self.wrapper = None
+        return self.placeholder if enabled else self.kallable.ref
+
+    def remove(self) -> None:
+        """Disable the marker for good, before it is removed from the session, setting the original back as it was."""
+        self.disable()
+        self.kallable.restore()
+
+    def spy(self, capacity: int, capture_arguments: bool) -> Spy:
+        """
+        Replace the mocked function or method with a spy, that records calls and forwards them to the original function
+        or method. The spy is removed when the marker is reset.
+        """
+        spy = Spy(self.kallable, capacity=capacity, capture_arguments=capture_arguments)
+        self.wrap(spy.wrap(self.kallable.decoration.strip(self.kallable.ref)))
+        return spy
+
+    def record(self, writer: CassetteWriter) -> None:
+        """
+        Replace the mocked function or method with a recorder, that forwards calls to the original function or method,
+        and records them into a cassette. The recorder is removed when the marker is reset.
+        """
+        original = self.kallable.decoration.strip(self.kallable.ref)
+        self.wrap(writer.wrap(self.kallable, original))
+
+    def wrap(self, wrapper: Callable) -> None:
+        """Replace the mocked function or method with a wrapper forwarding calls to the original, until reset."""
+        self.kallable.assign(wrapper)
+        self.wrapper = wrapper
+        self.mock.installed = False
+
     def reset(self):
         """Reset the marker and its mock object."""
         self.mock.reset()
@@ -0,0 +1,164 @@
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Mapping
+from typing import Any
+from typing import Callable
+
+MISSING = object()  # sentinel for keys absent from the actual mapping
+
+
+class Matcher(ABC):
+    """
+    Base class of argument matchers, to be passed to `to_receive` in place of expected values.
+
+    A matcher only examines the part of the actual argument it describes: checking two entries of a huge mapping does
+    not compare the whole mapping. Matchers are compiled once, when the `Expect` statement is defined, into plain
+    predicates that the dispatcher calls on each call.
+    """
+
+    @abstractmethod
+    def compile(self) -> Callable[[Any], bool]:
+        """Build the predicate checking whether an actual argument matches."""
+
+    def __eq__(self, other: Any) -> bool:
+        # Only used to render the diff of a mismatch, as calls are checked with compiled predicates
+        return self.compile()(other)
+
+    __hash__ = object.__hash__
+
+
+class Anything(Matcher):
+    """Matcher accepting any argument."""
+
+    def compile(self) -> Callable[[Any], bool]:
+        return lambda actual: True
+
+    def __repr__(self) -> str:
+        return "anything()"
+
+
+class InstanceOf(Matcher):
+    """Matcher accepting arguments that are instances of the given type, or of one of the given types."""
+
+    def __init__(self, *types: type) -> None:
+        self.types = types
+
+    def compile(self) -> Callable[[Any], bool]:
+        types = self.types
+        return lambda actual: isinstance(actual, types)
+
+    def __repr__(self) -> str:
+        return f"instance_of({', '.join(t.__name__ for t in self.types)})"
+
+
+class HasEntries(Matcher):
+    """
+    Matcher accepting mappings that hold the given entries, whatever their other entries. Only the given keys are
+    looked up, and their values may be matchers themselves.
+    """
+
+    def __init__(self, entries: Mapping) -> None:
+        self.entries = entries
+
+    def compile(self) -> Callable[[Any], bool]:
+        checks = [(key, compile_value(value)) for key, value in self.entries.items()]
+
+        def match(actual: Any) -> bool:
+            if not isinstance(actual, Mapping):
+                return False
+            for key, check in checks:
+                value = actual.get(key, MISSING)
+                if value is MISSING or not check(value):
+                    return False
+            return True
+
+        return match
+
+    def __repr__(self) -> str:
+        return f"has_entries({self.entries!r})"
+
+
+class Satisfies(Matcher):
+    """Matcher accepting arguments for which the given predicate returns a truthy value."""
+
+    def __init__(self, predicate: Callable[[Any], bool]) -> None:
+        self.predicate = predicate
+
+    def compile(self) -> Callable[[Any], bool]:
+        predicate = self.predicate
+        return lambda actual: bool(predicate(actual))
+
+    def __repr__(self) -> str:
+        return f"satisfies({getattr(self.predicate, '__qualname__', self.predicate)!r})"
+
+
+def anything() -> Anything:
+    """Match any argument."""
+    return Anything()
+
+
+def instance_of(*types: type) -> InstanceOf:
+    """Match arguments that are instances of the given type, or of one of the given types."""
+    return InstanceOf(*types)
+
+
+def has_entries(entries: Mapping | None = None, **kwargs: Any) -> HasEntries:
+    """Match mappings holding the given entries, passed as a mapping or as keyword arguments, whatever their others."""
+    return HasEntries({**(entries or {}), **kwargs})
+
+
+def satisfies(predicate: Callable[[Any], bool]) -> Satisfies:
+    """Match arguments for which the given predicate returns a truthy value."""
+    return Satisfies(predicate)
+
+
+def has_matchers(value: Any) -> bool:
+    """Check whether a value is a matcher, or a dictionary, list or tuple holding matchers at any depth."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Matcher):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def compile_value(expected: Any) -> Callable[[Any], bool]:
+    """
+    Compile an expected value into a predicate checking actual values:
+    * matchers are compiled into their own predicate,
+    * dictionaries, lists and tuples holding matchers, or instances of their subclasses, are matched element by element,
+    * other values are compared for equality, identical objects being accepted without comparing them.
+    """
+    if isinstance(expected, Matcher):
+        return expected.compile()
+    if not has_matchers(expected):
+        return lambda actual: actual is expected or actual == expected
+    if isinstance(expected, dict):
+        checks = {key: compile_value(value) for key, value in expected.items()}
+        return lambda actual: (
+            isinstance(actual, dict)
+            and actual.keys() == checks.keys()
+            and all(check(actual[key]) for key, check in checks.items())
+        )
+    checks = [compile_value(value) for value in expected]
+    container = list if isinstance(expected, list) else tuple  # lists and tuples are never equal to each other
+    return lambda actual: (
+        isinstance(actual, container)
+        and len(actual) == len(checks)
+        and all(check(value) for check, value in zip(checks, actual))
+    )
+
+
+def compile_arguments(args: tuple[Any], kwargs: dict[Any, Any]) -> tuple[Callable, Callable]:
+    """
+    Compile the expected arguments of a call into two predicates, checking positional and keyword arguments.
+    Arguments without matchers are compared as a whole: the comparison of tuples and dictionaries already accepts
+    identical elements without comparing them.
+    """
+    match_args = compile_value(args) if has_matchers(args) else args.__eq__
+    match_kwargs = compile_value(kwargs) if has_matchers(kwargs) else kwargs.__eq__
+    return match_args, match_kwargs
@@ -1,11 +1,31 @@
+from collections import deque
+from itertools import chain
+from operator import length_hint
+from os import getpid
+from threading import Lock
+from time import perf_counter_ns
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
 
+from .matchers import has_matchers
 from .mock_instance import MockInstance
+from .shared import forwarder
+from .stats import MarkerStats
 from expectise.exceptions import EnvironmentError
 from expectise.exceptions import ExpectationError
 from expectise.models.kallable import Kallable
-from expectise.utils.diff import Diff
+
+NO_INSTANCES = ()
+NO_KWARGS = frozenset()
+
+
+def arguments_key(args: tuple[Any], kwargs: dict[Any, Any]) -> tuple:
+    """Hashable key of call arguments, raising a `TypeError` if some of them are not hashable."""
+    key = (args, frozenset(kwargs.items()) if kwargs else NO_KWARGS)
+    hash(key)
+    return key
 
 
 class Mock:
@@ -16,40 +36,118 @@ class Mock:
     without using an `Expect` statement to define its mocked behavior.
 
     This mock object is used to store the configuration of a mocked function or method, and to override the mocked
-    method with the appropriate surrogate that will perform the checks on the calls and return the appropriate values.
+    method with the appropriate dispatcher that will perform the checks on the calls and return the appropriate values.
+
+    A single Mock object may hold multiple mock instances, each corresponding to one or several calls
+    to the mocked function or method. Mock instances are queued in the order of the `Expect` statements, and consumed
+    by the dispatcher as calls are received.
 
-    A single Mock object may hold multiple mock instances, each corresponding to a single call
-    to the mocked function or method.
+    In unordered mode, calls may be received in any order, e.g. from concurrent tasks or threads: each call claims a
+    mock instance expecting its arguments, wherever it is in the queue. Mock instances expecting hashable arguments are
+    indexed by their arguments, so that each call finds its own in constant time, whatever the number of mock instances
+    left. Other ones (expecting matchers or unhashable arguments, or any arguments) are scanned, in the order of the
+    `Expect` statements, when no indexed mock instance expects the arguments of the call.
+
+    Expectations may be shared with child processes: their calls are then forwarded to the process holding the
+    expectations, and dispatched there.
     """
 
+    __slots__ = (
+        "kallable",
+        "_dispatcher",
+        "_forwarded",
+        "_mismatch",
+        "_unexpected",
+        "_incomplete",
+        "expected",
+        "unbounded",
+        "instances",
+        "last_instance",
+        "installed",
+        "stats",
+        "feeder",
+        "_lock",
+        "unordered",
+        "by_arguments",
+        "scanned",
+        "sharing",
+    )
+
     def __init__(self, kallable: Kallable):
         self.kallable = kallable
+        self._dispatcher = None
+        self._forwarded = None  # dispatcher of the calls forwarded by child processes, built along with the dispatcher
+        self.stats: MarkerStats | None = None  # only set when stats are enabled on the session
+        self._lock = None  # serializes claims, allocated along with the queue
+        self.unordered = False
+        self.sharing = None  # identifier of the process holding the expectations, while they are shared
+        self.instances = NO_INSTANCES  # the queue is only allocated once needed, as most mocks are never used
         self.reset()
 
     def reset(self) -> None:
         """Reset the mock: remove all instances and expected calls."""
-        self.performed = 0
-        self.instances = []
+        self.expected = 0  # minimum number of calls expected by the mock instances
+        self.unbounded = 0  # number of mock instances expecting an unbounded number of calls
+        if self.instances:
+            self.instances.clear()  # the queue is kept for further tests, once allocated
+        self.last_instance = None
+        self.installed = False  # whether the dispatcher currently replaces the mocked function or method
+        self.feeder = None  # recorded calls queued once the mock instances described by `Expect` statements are used
+        if self.unordered:
+            self.set_unordered(False)  # the unordered mode only lasts for the test
+        self.by_arguments = {}  # in unordered mode, mock instances expecting hashable arguments, by arguments
+        self.scanned = []  # in unordered mode, other mock instances
 
     def new(self):
-        """Create a new mock instance, and override the mocked function or method with the appropriate surrogate."""
-        self.instances.append(MockInstance())
-        setattr(self.kallable.owner, self.kallable.name, self.override)
+        """
+        Create a new mock instance, and override the mocked function or method with the dispatcher, unless it is
+        already in place.
+        """
+        self.last_instance = self.queue()
+        self.install()
 
-    @property
-    def expected(self) -> int:
-        """Get the number of expected calls."""
-        return len(self.instances)
+    def queue(self) -> MockInstance:
+        """Queue a new mock instance, to describe the next expected call."""
+        mock_instance = MockInstance(self.kallable.id)
+        if self.instances is NO_INSTANCES:
+            self.instances = deque()
+            if self._lock is None:
+                self._lock = Lock()
+        self.instances.append(mock_instance)
+        self.count_calls(mock_instance, 1)
+        return mock_instance
 
-    @property
-    def last_instance(self) -> MockInstance:
-        """Get the last mock instance created."""
-        return self.instances[-1]
+    def count_calls(self, mock_instance: MockInstance, sign: int) -> None:
+        """Add the calls expected by a mock instance to the ones expected by the mock, or remove them with `sign=-1`."""
+        self.expected += sign * mock_instance.minimum
+        if mock_instance.maximum is None:
+            self.unbounded += sign
 
-    @property
-    def current_instance(self) -> MockInstance:
-        """Get the current mock instance, taking into account the number of calls already performed."""
-        return self.instances[self.performed - 1]
+    def install(self) -> None:
+        """Override the mocked function or method with the dispatcher, unless it is already in place."""
+        if not self.installed:
+            self.kallable.assign(self.dispatcher)
+            self.installed = True
+
+    def replay(self, records: Iterator[tuple[tuple[Any], dict[Any, Any], bool, Any]]) -> None:
+        """
+        Expect calls recorded as `(args, kwargs, is_error, value)` tuples, once the mock instances described by `Expect`
+        statements are used. Records are only pulled from the iterator when needed, one mock instance at a time.
+        """
+        self.feeder = records
+        if self._lock is None:
+            self._lock = Lock()
+        self.install()
+
+    def queue_record(self, record: tuple[tuple[Any], dict[Any, Any], bool, Any]) -> None:
+        """Queue a mock instance for a recorded call."""
+        args, kwargs, is_error, value = record
+        mock_instance = self.queue()
+        mock_instance.call_arguments = (args, kwargs)
+        if is_error:
+            mock_instance.execution_error = value
+        else:
+            mock_instance.return_value = value
 
     def add_argument_check(self, args: list[Any], kwargs: dict[Any, Any]) -> None:
         """Add an argument check to the mock."""
@@ -59,53 +157,303 @@ class Mock:
         """Add a return value to the mock."""
         self.last_instance.return_value = value
 
+    def add_return_values(self, values: Iterable[Any]) -> None:
+        """Add return values to the mock, to be returned one after the other, from consecutive calls."""
+        self.count_calls(self.last_instance, -1)
+        try:
+            self.last_instance.return_values = values  # calls are expected until values are exhausted, by default
+        finally:
+            self.count_calls(self.last_instance, 1)
+
     def add_execution_errors(self, value: Any) -> None:
         """Add an execution error to the mock."""
         self.last_instance.execution_error = value
 
-    def mark_call_received(self) -> None:
+    def set_call_count(self, minimum: int, maximum: int | None) -> None:
+        """Set the number of calls described by the last mock instance, `maximum` being None for unbounded calls."""
+        self.count_calls(self.last_instance, -1)
+        try:
+            self.last_instance.call_count = (minimum, maximum)
+        finally:
+            self.count_calls(self.last_instance, 1)
+
+    def claim(self, args: tuple[Any], kwargs: dict[Any, Any]) -> MockInstance:
+        """
+        Mark the mocked function or method as called, and return the mock instance describing the call.
+        Raise an exception if it is being called more times than expected.
+
+        A mock instance expecting an unbounded number of calls, with `at_least` or `any_number_of_times`, is left for
+        the next one once its minimum number of calls is received, as soon as a call is expected by the next one: the
+        arguments of the call, stripped of the bound instance or class, are checked against the next mock instance.
+        A mock instance expecting calls until its return values are exhausted is left for the next one once they are,
+        before the arguments of the call are checked: its return value is pulled when claiming it.
+
+        The mock instance at the head of the queue is claimed under the lock of the mock, and popped by the call
+        claiming it for the last time, if bounded: a mocked function or method can be called from several threads
+        concurrently, and each mock instance is still claimed the right number of times. Concurrent calls wait for the
+        lock, which is only held while claiming, not while checking arguments or responding.
+        """
+        with self._lock:
+            while True:
+                try:
+                    mock_instance = self.instances[0]
+                except IndexError:
+                    if self.feeder is not None and (record := next(self.feeder, None)) is not None:
+                        self.queue_record(record)
+                        continue
+                    raise ExpectationError(self.exceeded())
+                unbounded = mock_instance.maximum is None and mock_instance.has_call_count
+                if unbounded and mock_instance.received >= mock_instance.minimum:
+                    if len(self.instances) == 1 and self.feeder is not None:
+                        if (record := next(self.feeder, None)) is not None:
+                            self.queue_record(record)
+                    if len(self.instances) > 1 and self.instances[1].accepts(args, kwargs):
+                        self.instances.popleft()
+                        continue
+                if mock_instance.has_return_values and not mock_instance.reserve():
+                    self.instances.popleft()  # return values exhausted, the call is claimed by the next mock instance
+                    continue
+                mock_instance.received += 1
+                if mock_instance.received == mock_instance.maximum:
+                    self.instances.popleft()
+                return mock_instance
+
+    def exceeded(self) -> str:
+        """Describe the calls expected, once a call is received after all of them."""
+        kallable_id = self.kallable.id
+        if self.unbounded:
+            return f"{kallable_id} is expected to be called {self.expected} time(s) or more, up to its last statement."
+        return f"{kallable_id} is expected to be called {self.expected} time(s) only."
+
+    def set_unordered(self, unordered: bool) -> None:
         """
-        Mark the mocked function or method as called, and raise an exception if it is being called more times
-        than expected.
+        Switch to unordered mode, or back to ordered mode, the dispatcher being rebuilt and installed again if needed.
+        Mock instances are indexed as calls are received: the mode can be switched before or after `Expect` statements.
         """
-        self.performed += 1
-        if self.performed > self.expected:
-            raise ExpectationError(f"{self.kallable.id} is expected to be called {self.expected} time(s) only.")
+        if self._lock is None:
+            self._lock = Lock()
+        self.unordered = unordered
+        self._dispatcher = None
+        if self.installed:
+            self.installed = False
+            self.install()
 
-    def assert_arguments(self, func_args: list[Any], func_kwargs: dict[Any, Any]) -> None:
-        """Assert equality of function or method call arguments with the expected arguments."""
-        args, kwargs = self.current_instance.call_arguments
-        args_start_index = 1 if (self.kallable.is_bound_method and not self.kallable.decoration.is_staticmethod) else 0
-        msg = f"`{self.kallable.id}` called with " + "unexpected {} arguments:\n\n"
-        if args != func_args[args_start_index:]:
-            raise ExpectationError(msg.format("positional") + Diff.print(args, func_args[args_start_index]))
-        if kwargs != func_kwargs:
-            raise ExpectationError(msg.format("keyword") + Diff.print(kwargs, func_kwargs))
+    def set_sharing(self, sharing: bool) -> None:
+        """
+        Start or stop sharing expectations with child processes, the dispatcher being rebuilt and installed again.
+        While sharing, the dispatcher is installed right away: child processes forked before any `Expect` statement
+        inherit it, and forward their calls.
+        """
+        self.sharing = getpid() if sharing else None
+        self._dispatcher = None
+        if sharing or self.installed:
+            self.installed = False
+            self.install()
+
+    def dispatch(self, args: tuple[Any], kwargs: dict[Any, Any]) -> Any:
+        """
+        Dispatch a call forwarded by a child process, and return the expected value or raise the expected error.
+        Positional arguments are expected to be stripped of the bound instance or class already. Calls are dispatched
+        as local ones are, and counted in the stats of the mock as well.
+        """
+        self.dispatcher  # built once, along with the messages of the errors raised
+        forwarded = self._forwarded
+        if forwarded is None:
+            forwarded = self._forwarded = self._build_local_dispatcher(0, self._incomplete)
+        return forwarded(*args, **kwargs)
+
+    def index(self) -> None:
+        """Index the mock instances queued since the last call, by arguments if they are hashable, in unordered mode."""
+        while self.instances:
+            mock_instance = self.instances.popleft()
+            if mock_instance.has_argument_check:
+                args, kwargs = mock_instance.call_arguments
+                if not has_matchers(args) and not has_matchers(kwargs):
+                    try:
+                        key = arguments_key(args, kwargs)
+                    except TypeError:
+                        pass
+                    else:
+                        self.by_arguments.setdefault(key, deque()).append(mock_instance)
+                        continue
+            self.scanned.append(mock_instance)
+
+    def claim_unordered(self, args: tuple[Any], kwargs: dict[Any, Any]) -> MockInstance:
+        """
+        Mark the mocked function or method as called with the given arguments, and return a mock instance expecting
+        them, in unordered mode. Raise an exception if no mock instance left expects them.
+
+        Positional arguments are expected to be stripped of the bound instance or class already. Calls are claimed
+        under a lock, as mock instances are removed from the index and from the scanned ones once fully claimed, or
+        once their return values are exhausted.
+        """
+        with self._lock:
+            while True:
+                self.index()
+                try:
+                    bucket = self.by_arguments.get(arguments_key(args, kwargs))
+                except TypeError:
+                    bucket = None
+                if bucket:
+                    mock_instance = bucket[0]
+                    if mock_instance.has_return_values and not mock_instance.reserve():
+                        bucket.popleft()  # return values exhausted, the call is claimed by the next mock instance
+                        continue
+                    mock_instance.received += 1
+                    if mock_instance.received == mock_instance.maximum:
+                        bucket.popleft()
+                    return mock_instance
+                for position, mock_instance in enumerate(self.scanned):
+                    if mock_instance.accepts(args, kwargs):
+                        if mock_instance.has_return_values and not mock_instance.reserve():
+                            del self.scanned[position]
+                            break
+                        mock_instance.received += 1
+                        if mock_instance.received == mock_instance.maximum:
+                            del self.scanned[position]
+                        return mock_instance
+                else:
+                    if self.feeder is not None and (record := next(self.feeder, None)) is not None:
+                        self.queue_record(record)
+                        continue
+                    raise ExpectationError(self._unexpected, actual=(args, kwargs))
+
+    def missing_calls(self) -> int:
+        """
+        Count the calls that are still expected, using the counts of calls received by the mock instances left.
+        This is meant to be called once the mock is not used anymore, typically when tearing down.
+        """
+        missing = 0
+        # in unordered mode, mock instances are indexed away from the queue as calls are received: the ones fully
+        # claimed are removed, once they received their expected calls
+        left = chain(self.instances, self.scanned, *self.by_arguments.values())
+        for mock_instance in left:
+            if mock_instance.has_return_values and not mock_instance.has_call_count:
+                # calls are expected until return values are exhausted, that may never be: at least one call is missing
+                if mock_instance.has_return_values_left():
+                    missing += 1
+                continue
+            missing += max(mock_instance.minimum - mock_instance.received, 0)
+        if self.feeder is not None:
+            missing += length_hint(self.feeder)  # recorded calls left, counted without reading them if possible
+        return missing
+
+    def assert_arguments(self, mock_instance: MockInstance, args: tuple[Any], kwargs: dict[Any, Any]) -> None:
+        """
+        Assert that function or method call arguments match the expected arguments, using the predicates compiled from
+        them. Positional arguments are expected to be stripped of the bound instance or class already.
+        """
+        if not mock_instance.match_args(args):
+            expected_args = mock_instance.call_arguments[0]
+            raise ExpectationError(self._mismatch.format("positional"), expected=expected_args, actual=args)
+        if not mock_instance.match_kwargs(kwargs):
+            expected_kwargs = mock_instance.call_arguments[1]
+            raise ExpectationError(self._mismatch.format("keyword"), expected=expected_kwargs, actual=kwargs)
 
     @property
-    def override(self) -> Callable:
+    def dispatcher(self) -> Callable:
         """
-        Return the appropriate override of the mocked function or method to be applied during tests,
-        according to Expect statements. This override includes:
+        Return the override of the mocked function or method to be applied during tests, according to Expect
+        statements. The dispatcher is built once for the lifetime of the mock, and reads the expected calls from
+        the queue of mock instances. It includes:
         * checks on whether the function or method is called, and the right number of times,
         * checks on whether the function or method is called with the expected arguments,
         * the appropriate return value or execution error as configured by the `Expect` statements.
         """
+        if self._dispatcher is None:
+            self._dispatcher = self._build_dispatcher()
+        return self._dispatcher
 
-        def func(*args, **kwargs):
-            self.mark_call_received()
-            mock_instance = self.current_instance
-            if not mock_instance.has_return_value and not mock_instance.has_execution_error:
-                raise EnvironmentError(
-                    f"Incomplete `Expect` statement for callable `{self.kallable.id}`. "
-                    "Make sure the mock is properly set up by defining the expected return value or execution error."
-                )
-            if mock_instance.has_argument_check:
-                self.assert_arguments(args, kwargs)
-            if mock_instance.has_return_value:
-                return mock_instance.return_value
-            if mock_instance.has_execution_error:
-                raise mock_instance.execution_error
-
-        func._original_id = self.kallable.id
-        return self.kallable.decoration.add(func)
+    def _build_dispatcher(self) -> Callable:
+        """Precompute everything that does not depend on the call itself, and build the dispatcher function."""
+        kallable = self.kallable
+        offset = kallable.args_offset
+        self._mismatch = f"`{kallable.id}` called with " + "unexpected {} arguments:\n\n"
+        self._unexpected = f"`{kallable.id}` called with unexpected arguments, in any order:\n\n(positional, keyword): "
+        self._incomplete = incomplete = (
+            f"Incomplete `Expect` statement for callable `{kallable.id}`. "
+            "Make sure the mock is properly set up by defining the expected return value or execution error."
+        )
+        func = self._build_local_dispatcher(offset, incomplete)
+        self._forwarded = None if offset else func  # forwarded calls are stripped of the bound instance or class
+
+        if self.sharing is not None:
+            # In child processes inheriting the dispatcher, calls are forwarded to the process holding the expectations
+            local, forward, pid = func, forwarder(kallable), self.sharing
+
+            def func(*args, **kwargs):
+                if getpid() == pid:
+                    return local(*args, **kwargs)
+                return forward(*args, **kwargs)
+
+        if kallable.is_coroutine:
+            # Coroutine functions are replaced by a coroutine function: nothing happens until the coroutine is awaited,
+            # and since the dispatch does not await anything, concurrent tasks each consume a single mock instance.
+            dispatch = func
+
+            async def func(*args, **kwargs):
+                return dispatch(*args, **kwargs)
+
+        func._original_id = kallable.id
+        return kallable.decoration.add(func)
+
+    def _build_local_dispatcher(self, offset: int, incomplete: str) -> Callable:
+        """Build the function dispatching calls received by the process holding the expectations."""
+        claim = self.claim_unordered if self.unordered else self.claim
+        assert_arguments = self.assert_arguments
+        if self.stats is not None:
+            # the dispatcher is only instrumented when stats are enabled, otherwise it does not pay for them
+            claim, assert_arguments = self._instrument(claim, assert_arguments)
+
+        if self.unordered:
+
+            def func(*args, **kwargs):
+                # the mock instance claimed expects the arguments of the call already
+                mock_instance = claim(args[offset:] if offset else args, kwargs)
+                if mock_instance.respond is None:
+                    raise EnvironmentError(incomplete)
+                return mock_instance.respond()
+
+        else:
+
+            def func(*args, **kwargs):
+                call_args = args[offset:] if offset else args
+                mock_instance = claim(call_args, kwargs)
+                if mock_instance.respond is None:
+                    raise EnvironmentError(incomplete)
+                if mock_instance.has_argument_check:
+                    assert_arguments(mock_instance, call_args, kwargs)
+                return mock_instance.respond()
+
+        return func
+
+    def _instrument(self, claim: Callable, assert_arguments: Callable) -> tuple[Callable, Callable]:
+        """
+        Wrap the functions used by the dispatcher, to count calls and time argument checks. The diff of mismatching
+        arguments is rendered right away, instead of when the error is displayed, to be timed as well.
+        """
+        stats = self.stats
+
+        def counted_claim(*args) -> MockInstance:
+            stats.calls += 1
+            return claim(*args)
+
+        def timed_assert_arguments(mock_instance: MockInstance, args: tuple[Any], kwargs: dict[Any, Any]) -> None:
+            start = perf_counter_ns()
+            try:
+                assert_arguments(mock_instance, args, kwargs)
+            except ExpectationError as error:
+                rendering = perf_counter_ns()
+                stats.argument_check_ns += rendering - start
+                str(error)  # cached by the error
+                stats.diff_ns += perf_counter_ns() - rendering
+                raise
+            stats.argument_check_ns += perf_counter_ns() - start
+
+        return counted_claim, timed_assert_arguments
+
+    def set_stats(self, stats: MarkerStats | None) -> None:
+        """Start or stop collecting stats, the dispatcher being rebuilt and installed again by the next `new` call."""
+        self.stats = stats
+        self._dispatcher = None
+        self.installed = False
@@ -1,29 +1,85 @@
+from collections import deque
+from functools import partial
+from itertools import chain
+from itertools import repeat
 from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import Tuple
 
+from .matchers import compile_arguments
 from expectise.exceptions import EnvironmentError
+from expectise.exceptions import ExpectationError
+
+EXHAUSTED = object()  # sentinel for iterators of return values that are exhausted
+
+
+def raise_error(error: Exception) -> None:
+    raise error
 
 
 class MockInstance:
     """
     A mocked function or method may be called several times during a test, with varying arguments and return values.
-    This class is used to store the configuration of a single call to the mocked method.
+    This class is used to store the configuration of a single call to the mocked method, or of a number of identical
+    calls: a single mock instance is used whatever the number of calls it describes.
+
+    The outcome of the call is compiled once, when the return value or execution error is set: the mock dispatcher
+    only has to call `respond` to return the value or raise the error, without inspecting the configuration again.
+    `respond` does not hold the mock instance itself, so that mock instances are freed as soon as a test is torn down,
+    without waiting for the garbage collector to break reference cycles.
     """
 
-    def __init__(self):
+    __slots__ = (
+        "kallable_id",
+        "has_argument_check",
+        "_call_arguments",
+        "match_args",
+        "match_kwargs",
+        "has_return_value",
+        "_return_value",
+        "has_return_values",
+        "_return_values",
+        "_reserved",
+        "has_execution_error",
+        "_execution_error",
+        "respond",
+        "has_call_count",
+        "minimum",
+        "maximum",
+        "received",
+    )
+
+    def __init__(self, kallable_id: str):
+        self.kallable_id = kallable_id
         self.has_argument_check = False
         self._call_arguments = None
+        self.match_args: Callable | None = None  # predicates compiled from the expected arguments, if any
+        self.match_kwargs: Callable | None = None
         self.has_return_value = False
         self._return_value = None
+        self.has_return_values = False
+        self._return_values = None
         self.has_execution_error = False
         self._execution_error = None
+        self.respond: Callable | None = None  # set as soon as the mock instance configuration is complete
+        self._reserved = None  # return values pulled for the calls claimed, until they respond
+        self.has_call_count = False
+        self.minimum = 1
+        self.maximum = 1  # None for an unbounded number of calls
+        self.received = 0  # number of calls that claimed this mock instance, counted under the lock of the mock
+
+    def accepts(self, args: tuple[Any], kwargs: dict[Any, Any]) -> bool:
+        """Check whether the mock instance expects the given arguments, stripped of the bound instance or class."""
+        return not self.has_argument_check or (self.match_args(args) and self.match_kwargs(kwargs))
 
     def assert_incomplete(self) -> None:
         """
         Check that the mock instance configuration is not complete, and raise an error if it is.
         A mock instance is considered complete when it has either a return value or an execution error.
         """
-        if self.has_return_value:
+        if self.has_return_value or self.has_return_values:
             raise EnvironmentError("Return value already set for this mock instance.")
         if self.has_execution_error:
             raise EnvironmentError("Execution error already set for this mock instance.")
@@ -37,8 +93,23 @@ class MockInstance:
         if self.has_argument_check:
             raise EnvironmentError("Arguments check already set for this mock instance.")
         self._call_arguments = value
+        self.match_args, self.match_kwargs = compile_arguments(*value)
         self.has_argument_check = True
 
+    @property
+    def call_count(self) -> Tuple[int, int | None]:
+        return self.minimum, self.maximum
+
+    @call_count.setter
+    def call_count(self, value: Tuple[int, int | None]) -> None:
+        if self.has_call_count:
+            raise EnvironmentError("Number of calls already set for this mock instance.")
+        minimum, maximum = value
+        if minimum < 0 or (maximum is not None and (maximum < 1 or maximum < minimum)):
+            raise EnvironmentError(f"Invalid number of calls for this mock instance: {minimum} to {maximum}.")
+        self.minimum, self.maximum = value
+        self.has_call_count = True
+
     @property
     def return_value(self) -> Any:
         return self._return_value
@@ -48,6 +119,21 @@ class MockInstance:
         self.assert_incomplete()
         self._return_value = value
         self.has_return_value = True
+        self.respond = repeat(value).__next__
+
+    @property
+    def return_values(self) -> Iterator[Any]:
+        return self._return_values
+
+    @return_values.setter
+    def return_values(self, values: Iterable[Any]) -> None:
+        self.assert_incomplete()
+        self._return_values = iter(values)
+        self._reserved = deque()
+        self.has_return_values = True
+        if not self.has_call_count:
+            self.maximum = None  # unless specified otherwise, calls are expected until values are exhausted
+        self.respond = self._reserved.popleft  # return values are pulled when calls are claimed
 
     @property
     def execution_error(self) -> Exception:
@@ -58,3 +144,26 @@ class MockInstance:
         self.assert_incomplete()
         self._execution_error = value
         self.has_execution_error = True
+        self.respond = partial(raise_error, value)
+
+    def has_return_values_left(self) -> bool:
+        """Check whether return values are left, pulling a single one from the iterator and putting it back."""
+        value = next(self._return_values, EXHAUSTED)
+        if value is EXHAUSTED:
+            return False
+        self._return_values = chain((value,), self._return_values)
+        return True
+
+    def reserve(self) -> bool:
+        """
+        Pull the return value of a call claiming the mock instance, under the lock of the mock: iterators such as
+        generators cannot be advanced concurrently. Once return values are exhausted, return False if calls are expected
+        until they are, so that the call is claimed by the next mock instance, or raise an exception otherwise.
+        """
+        value = next(self._return_values, EXHAUSTED)
+        if value is EXHAUSTED:
+            if not self.has_call_count:
+                return False
+            raise ExpectationError(f"`{self.kallable_id}` was called after all its expected return values were used.")
+        self._reserved.append(value)
+        return True
@@ -1,11 +1,21 @@
+import json
+from time import perf_counter_ns
+from types import MethodType
+from types import ModuleType
 from typing import Callable
+from typing import Iterable
+from weakref import WeakKeyDictionary
 
+from .checkpoint import Checkpoint
 from .marker import Marker
+from .stats import MarkerStats
 from expectise.exceptions import EnvironmentError
 from expectise.exceptions import ExpectationError
 from expectise.models import Lifespan
 from expectise.models.decoration import Decoration
 from expectise.models.kallable import Kallable
+from expectise.models.trigger import invalidate_triggers
+from expectise.models.trigger import SwitchTrigger
 from expectise.models.trigger import Trigger
 
 
@@ -17,18 +27,111 @@ class Session:
     * marking functions and methods as mocked,
     * storing the mocked functions and methods,
     * tearing down the session and resetting the mocked functions and methods after each test.
+
+    Markers touched during a test (used in `Expect` statements, disabled, or temporary) are tracked, so that tearing
+    down the session only restores those, regardless of the total number of markers.
+
+    Markers are also indexed by the identity of the functions that may be handed to `Expect` statements: original
+    functions, placeholders and dispatchers. Such lookups are a single dictionary hit, once the index is warm.
+
+    Stats of each marker may be collected, for instance to find out which mocks dominate the runtime of a test suite.
+    They are disabled by default, and mocked calls do not pay for them unless they are enabled.
     """
 
     def __init__(self):
-        """Initialize the session with an empty dictionary of markers."""
+        """Initialize the session with empty dictionaries of markers, and of markers touched during the test."""
         self.markers = {}
+        self.touched = {}
+        self.index = WeakKeyDictionary()
+        self.worker_id = "main"  # identifier of the pytest-xdist worker process the session is serving, if any
+        self.marker_stats = None  # stats of each marker, by identifier, only when stats are enabled
+        self.checkpoints = []  # checkpoints the session can be restored to, from the oldest to the latest
+
+    @staticmethod
+    def index_key(ref: Callable) -> Callable:
+        """Get the function underlying a bound method or a decorated function, that is used as an index key."""
+        if isinstance(ref, MethodType):
+            return ref.__func__
+        if isinstance(ref, property):
+            return ref.fget
+        if isinstance(ref, (classmethod, staticmethod)):
+            return ref.__func__
+        return ref
+
+    def add_to_index(self, key: Callable, marker: Marker) -> None:
+        """Index a marker by a function, unless the function cannot be weakly referenced, e.g. builtins."""
+        try:
+            self.index[key] = marker
+        except TypeError:
+            pass  # such functions are looked up by identifier instead
 
     def mark_method(self, kallable: Kallable, trigger: Trigger, lifespan: Lifespan) -> Marker:
         """Mark a function or method as mocked, without enabling the marker yet."""
         marker = Marker(kallable, trigger=trigger, lifespan=lifespan)
         self.markers[kallable.id] = marker
+        self.add_to_index(self.index_key(kallable.ref), marker)
+        if lifespan == Lifespan.TEMPORARY:
+            self.touched[kallable.id] = marker  # temporary markers always have to be removed during tear down
+        if self.marker_stats is not None:
+            marker.mock.set_stats(self.marker_stats.setdefault(kallable.id, MarkerStats()))
         return marker
 
+    def mark_methods(self, kallables: list[Kallable], trigger: Trigger, lifespan: Lifespan) -> list[Marker]:
+        """
+        Mark several functions or methods as mocked at once, and set them up in a single pass: the trigger is checked
+        once for all of them.
+        """
+        markers = [self.mark_method(kallable, trigger=trigger, lifespan=lifespan) for kallable in kallables]
+        if trigger.is_met():
+            self.toggle_markers(markers, enabled=True)
+        return markers
+
+    @staticmethod
+    def toggle_markers(markers: list[Marker], enabled: bool) -> None:
+        """
+        Enable or disable several markers in a single batch: the functions of a module are set with a single update of
+        its namespace, while methods are set behind their interceptor, without mutating their class.
+        """
+        attributes = {}
+        for marker in markers:
+            value = marker.toggle(enabled)
+            if isinstance(owner := marker.kallable.owner, ModuleType):
+                attributes.setdefault(owner, {})[marker.kallable.name] = value
+            else:
+                marker.kallable.assign(value)
+        for owner, values in attributes.items():
+            vars(owner).update(values)
+
+    def refresh_markers(self, markers: Iterable[Marker]) -> None:
+        """
+        Enable or disable markers according to their trigger, in batches. Markers explicitly disabled are left
+        untouched, as well as the ones touched during the test (mocked by `Expect` statements, spying or recording),
+        which are set up again when tearing down.
+        """
+        toggled = {True: [], False: []}
+        for marker in markers:
+            if not marker.disabled and marker.kallable.id not in self.touched:
+                if (met := marker.trigger.is_met()) != marker.enabled:
+                    toggled[met].append(marker)
+        for enabled, toggled_markers in toggled.items():
+            self.toggle_markers(toggled_markers, enabled=enabled)
+
+    def invalidate_triggers(self) -> None:
+        """
+        Invalidate the cached outcome of all triggers, e.g. once the environment has changed, and enable or disable the
+        markers accordingly.
+        """
+        invalidate_triggers()
+        self.refresh_markers(self.markers.values())
+
+    def switch(self, on: bool) -> None:
+        """
+        Flip the process-wide switch of `SwitchTrigger` triggers, and enable or disable the markers depending on it in
+        batches.
+        """
+        SwitchTrigger.on = on
+        self.refresh_markers(marker for marker in self.markers.values() if isinstance(marker.trigger, SwitchTrigger))
+
     def get_marker(self, mock_or_ref: Callable) -> Marker:
         """
         Get a marker, given an inpput callable that may be a mock already set, or a function to be mocked on the fly.
@@ -41,6 +144,25 @@ class Session:
         The mock object keeps track of the original callable identifier, which creates the connection between the marker
         and the mock object.
         """
+        key = self.index_key(mock_or_ref)
+        try:
+            marker = self.index.get(key)
+        except TypeError:
+            marker = None  # callables that cannot be weakly referenced are not indexed
+        if marker is None or self.markers.get(marker.kallable.id) is not marker:
+            # unknown callable, or marker removed from the session since it was indexed
+            marker = self.find_marker(mock_or_ref)
+            self.add_to_index(key, marker)
+
+        self.touched[marker.kallable.id] = marker
+        if not marker.enabled and not marker.disabled and marker.kallable.klass is None:
+            # for standalone functions without explicitly disabled markers, the marker is enabled on the fly
+            marker.set_up()
+
+        return marker
+
+    def find_marker(self, mock_or_ref: Callable) -> Marker:
+        """Find the marker of a callable that is not indexed yet, using its identifier."""
         decoration = Decoration(mock_or_ref)
         function = decoration.strip(mock_or_ref)
 
@@ -58,36 +180,89 @@ class Session:
                     "with the `@mock_if` decorator, or through standalone `mock` statements."
                 )
 
-        marker = self.markers[kallable_id]
-        if marker.kallable.klass is None and not marker.disabled:
-            # for standalone functions without explicitly disabled markers, the marker is enabled on the fly
-            marker.set_up()
-
-        return marker
+        return self.markers[kallable_id]
 
     def tear_down(self, exception: Exception = None):
         """
-        Tear down the session and reset the mocked functions and methods.
+        Tear down the session and reset the mocked functions and methods touched during the test.
         * Permanent markers are not removed during tear down, only their mocks are reset.
         * Temporary markers are fully disabled during tear down, and removed from the session.
         * If some function or method calls are still expected, an error is raised to indicate the missing expectations.
+
+        If checkpoints were taken, only the scope of the latest one is torn down, e.g. by the module-scoped fixture that
+        took it: the checkpoint is dropped, the markers touched before it was taken are torn down as well, and the
+        session is restored to the previous checkpoint, if any, that outer scopes took.
+        """
+        touched = {}
+        if self.checkpoints:
+            touched.update(self.checkpoints.pop().touched)
+        touched.update(self.touched)
+        self.touched = {}
+        self.roll_back(touched, checkpoint=self.checkpoints[-1] if self.checkpoints else None, exception=exception)
+
+    def checkpoint(self) -> Checkpoint:
         """
+        Take a checkpoint of the session, that it can be restored to with `restore`. Markers set up so far, e.g. by a
+        module-scoped fixture, are kept as they are when restoring, instead of being created again by each test.
+        Expectations are not part of checkpoints: an error is raised if some calls are still expected.
+        """
+        for kallable_id, marker in self.touched.items():
+            if marker.mock.expected or marker.mock.unbounded:
+                raise EnvironmentError(
+                    f"`{kallable_id}` is expected to be called, while checkpoints cannot hold expectations. "
+                    "Take the checkpoint before `Expect` statements."
+                )
+        checkpoint = Checkpoint(self.markers, touched=self.touched)
+        self.checkpoints.append(checkpoint)
+        self.touched = {}
+        return checkpoint
+
+    def restore(self, checkpoint: Checkpoint, exception: Exception = None):
+        """
+        Restore the session to a checkpoint, only walking the markers touched since it was taken.
+        * Markers that existed at the checkpoint are reset, and disabled again if they were disabled back then.
+        * Permanent markers created since then are reset, temporary ones are disabled and removed from the session.
+        * If some function or method calls are still expected, an error is raised to indicate the missing expectations.
+
+        Checkpoints taken after the one restored are dropped.
+        """
+        if checkpoint not in self.checkpoints:
+            raise EnvironmentError("Cannot restore a checkpoint that was dropped by tearing down the session.")
+        touched = {}
+        while self.checkpoints[-1] is not checkpoint:
+            touched.update(self.checkpoints.pop().touched)
+        touched.update(self.touched)
+        self.touched = {}
+        self.roll_back(touched, checkpoint=checkpoint, exception=exception)
+
+    def roll_back(self, touched: dict[str, Marker], checkpoint: Checkpoint = None, exception: Exception = None):
+        """Reset the given markers touched since the checkpoint, if any, and raise errors for missing calls."""
         expected_calls = []
         temporary_markers = []
-        for kallable_id, marker in self.markers.items():
+        checkpoint_markers = checkpoint.markers if checkpoint is not None else {}
+        for kallable_id, marker in touched.items():
+            start = perf_counter_ns() if self.marker_stats is not None else 0
 
-            if (gap := marker.mock.expected - marker.mock.performed) > 0:
+            if (gap := marker.mock.missing_calls()) > 0:
                 expected_calls.append(f"`{kallable_id}` still expected to be called {gap} time(s).")
 
-            if marker.lifespan == Lifespan.PERMANENT:
+            if checkpoint_markers.get(kallable_id) is marker:
+                checkpoint.reset(marker)  # Markers of the checkpoint are kept, in the state they had back then
+            elif marker.lifespan == Lifespan.PERMANENT:
                 marker.reset()  # Permanent markers do not go away during tear_down, only their mocks are reset
             elif marker.lifespan == Lifespan.TEMPORARY:
-                marker.disable()  # Temporary markers are fully disabled during tear_down, and removed from the session
+                marker.remove()  # Temporary markers are fully disabled during tear_down, and removed from the session
                 temporary_markers.append(kallable_id)
 
-        # Fully removing all references to temporary markers
+            if marker.mock.stats is not None:
+                marker.mock.stats.tear_down_ns += perf_counter_ns() - start
+
+        # Fully removing all references to temporary markers, putting back the checkpoint markers they replaced
         for kallable_id in temporary_markers:
             self.markers.pop(kallable_id)
+            if (marker := checkpoint_markers.get(kallable_id)) is not None:
+                self.markers[kallable_id] = marker
+                checkpoint.reset(marker)
 
         if exception:
             raise exception
@@ -96,6 +271,32 @@ class Session:
         if expected_calls:
             raise ExpectationError("\n".join(expected_calls))
 
+    def enable_stats(self) -> None:
+        """Start collecting stats for all markers, current and future ones. Stats collected so far are kept."""
+        if self.marker_stats is None:
+            self.marker_stats = {}
+        for kallable_id, marker in self.markers.items():
+            marker.mock.set_stats(self.marker_stats.setdefault(kallable_id, MarkerStats()))
+
+    def disable_stats(self) -> None:
+        """Stop collecting stats, and drop the stats collected so far."""
+        for marker in self.markers.values():
+            marker.mock.set_stats(None)
+        self.marker_stats = None
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Get the stats collected for each marker, by identifier, sorted by decreasing time spent in Expectise.
+        Durations are in nanoseconds. The result is empty unless stats are enabled.
+        """
+        ranked = sorted((self.marker_stats or {}).items(), key=lambda item: item[1].total_ns, reverse=True)
+        return {kallable_id: marker_stats.as_dict() for kallable_id, marker_stats in ranked}
+
+    def dump_stats(self, path: str) -> None:
+        """Write the stats collected for each marker to a JSON file, along with the worker identifier."""
+        with open(path, "w") as f:
+            json.dump({"worker_id": self.worker_id, "markers": self.stats()}, f, indent=2)
+
 
 # Singleton instance of the session
 session = Session()
@@ -0,0 +1,166 @@
+import json
+import os
+from threading import Lock
+from threading import Thread
+from typing import Any
+from typing import Callable
+
+from expectise.exceptions import EnvironmentError
+from expectise.exceptions import ExpectationError
+from expectise.models.kallable import Kallable
+
+# Identifier and channel address of the process holding the expectations, and identifiers of the functions and methods
+# shared, inherited by child processes, whether they are forked or spawned. `multiprocessing` is only imported by
+# processes sharing expectations, or calling shared functions and methods.
+ENV_KEY = "EXPECTISE_SHARED"
+CLIENT = None  # process identifier, connection to the channel and lock of the current child process, once connected
+
+
+def remote_ids() -> frozenset[str]:
+    """Identifiers of the functions and methods whose calls are forwarded to the parent process, in a child process."""
+    if (value := os.environ.get(ENV_KEY)) is None:
+        return frozenset()
+    shared = json.loads(value)
+    return frozenset(shared["ids"]) if shared["pid"] != os.getpid() else frozenset()
+
+
+def client() -> tuple[int, Any, Lock]:
+    """Connect to the channel of the parent process, once per child process."""
+    global CLIENT
+    if CLIENT is None or CLIENT[0] != os.getpid():
+        from multiprocessing import current_process
+        from multiprocessing.connection import Client
+
+        address = json.loads(os.environ[ENV_KEY])["address"]
+        connection = Client(tuple(address) if isinstance(address, list) else address, authkey=current_process().authkey)
+        CLIENT = (os.getpid(), connection, Lock())
+    return CLIENT
+
+
+def forwarder(kallable: Kallable) -> Callable:
+    """
+    Build the function forwarding calls from a child process to the parent process, that checks them against its
+    expectations, and sends back the value to return or the error to raise.
+    """
+    kallable_id = kallable.id
+    offset = kallable.args_offset
+
+    def func(*args, **kwargs):
+        _, connection, lock = client()
+        with lock:  # threads of the child process share its connection
+            connection.send((kallable_id, args[offset:] if offset else args, kwargs))
+            is_error, value = connection.recv()
+        if is_error:
+            raise value
+        return value
+
+    return func
+
+
+class Channel:
+    """
+    Channel receiving the calls forwarded by child processes, in the process holding the expectations. Each child
+    process connects once, and its calls are dispatched by a thread of its own: mock instances are claimed from the
+    queues of the parent process, so that calls are accounted for when tearing down, whatever the process performing
+    them.
+    """
+
+    def __init__(self, mocks: dict[str, Any]) -> None:
+        from multiprocessing import current_process
+        from multiprocessing.connection import Listener
+
+        self.authkey = current_process().authkey
+        self.mocks = mocks  # mocks of the functions and methods shared, by identifier
+        self.listener = Listener(authkey=self.authkey)
+        self.closed = False
+        self.thread = Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    @property
+    def address(self) -> Any:
+        return self.listener.address
+
+    def serve(self) -> None:
+        """Accept connections from child processes, until the channel is closed."""
+        while not self.closed:
+            try:
+                connection = self.listener.accept()
+            except Exception:
+                continue  # failed authentication, or listener closed
+            Thread(target=self.handle, args=(connection,), daemon=True).start()
+
+    def handle(self, connection: Any) -> None:
+        """Dispatch the calls of a child process, until it disconnects."""
+        with connection:
+            while True:
+                try:
+                    kallable_id, args, kwargs = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    reply = (False, self.mocks[kallable_id].dispatch(args, kwargs))
+                except ExpectationError as error:
+                    reply = (True, ExpectationError(str(error)))  # expected arguments may not be picklable
+                except Exception as error:
+                    reply = (True, error)
+                try:
+                    connection.send(reply)
+                except Exception as error:
+                    message = f"The outcome of a call to `{kallable_id}` cannot be sent to the child process: {error}"
+                    try:
+                        connection.send((True, EnvironmentError(message)))
+                    except Exception:
+                        return  # the child process disconnected
+
+    def close(self) -> None:
+        """Stop accepting connections. Child processes connected already keep their own thread until they exit."""
+        from multiprocessing.connection import Client
+
+        self.closed = True
+        try:
+            Client(self.address, authkey=self.authkey).close()  # wakes the thread accepting connections
+        except OSError:
+            pass
+        self.thread.join()
+        self.listener.close()
+
+
+class Shared:
+    """
+    Context manager sharing the expectations of functions or methods marked as mocked with child processes, e.g. the
+    workers of a `multiprocessing.Pool` or of a `ProcessPoolExecutor`.
+    * In the process holding the expectations, calls are dispatched as usual.
+    * In forked child processes, the dispatcher inherited forwards calls to the parent process.
+    * In spawned child processes, markers set up while the context manager is active forward calls to the parent
+    process, instead of raising errors.
+    Forwarded calls are checked against the expectations of the parent process, which counts them, and the value
+    returned or the error raised is sent back to the child process.
+    """
+
+    def __init__(self, markers: list) -> None:
+        self.markers = markers
+        self.channel = None
+        self.previous = None
+
+    def __enter__(self) -> "Shared":
+        self.channel = Channel({marker.kallable.id: marker.mock for marker in self.markers})
+        self.previous = os.environ.get(ENV_KEY)
+        os.environ[ENV_KEY] = json.dumps(
+            {
+                "pid": os.getpid(),
+                "address": self.channel.address,
+                "ids": [marker.kallable.id for marker in self.markers],
+            }
+        )
+        for marker in self.markers:
+            marker.mock.set_sharing(True)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        for marker in self.markers:
+            marker.mock.set_sharing(False)
+        if self.previous is None:
+            os.environ.pop(ENV_KEY, None)
+        else:
+            os.environ[ENV_KEY] = self.previous
+        self.channel.close()
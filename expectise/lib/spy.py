@@ -0,0 +1,86 @@
+from itertools import count
+from typing import Any
+from typing import Callable
+
+from expectise.models.kallable import Kallable
+
+
+class CallRecord:
+    """Record of a single call to a spied function or method."""
+
+    __slots__ = ("index", "args", "kwargs")
+
+    def __init__(self) -> None:
+        self.index = -1  # rank of the call among all calls to the spied function or method, -1 if not used yet
+        self.args = None
+        self.kwargs = None
+
+    def __repr__(self) -> str:
+        return f"CallRecord(index={self.index}, args={self.args!r}, kwargs={self.kwargs!r})"
+
+
+class Spy:
+    """
+    Spy to observe calls to a function or method that is marked as mocked, without replacing its behavior.
+
+    Calls are recorded in a ring buffer of preallocated records: only the last `capacity` calls are kept, so that
+    the memory footprint of the spy is fixed, however many times the spied function or method is called.
+    Arguments are captured only if `capture_arguments` is set. The bound instance or class, if any, is not captured.
+    """
+
+    def __init__(self, kallable: Kallable, capacity: int = 1024, capture_arguments: bool = True) -> None:
+        if capacity < 1:
+            raise ValueError("Spy capacity should be a positive integer.")
+        self.kallable = kallable
+        self.capacity = capacity
+        self.capture_arguments = capture_arguments
+        self.records = [CallRecord() for _ in range(capacity)]
+        self._counter = count()  # `next` is atomic, so that concurrent calls are each recorded in their own slot
+
+    @property
+    def call_count(self) -> int:
+        """Get the number of calls received."""
+        return max(record.index for record in self.records) + 1
+
+    @property
+    def calls(self) -> list[CallRecord]:
+        """
+        Get the records of the last calls received, oldest first.
+        Records are reused once the buffer is full: they should not be kept around while the spy is still in use.
+        """
+        return sorted((record for record in self.records if record.index >= 0), key=lambda record: record.index)
+
+    @property
+    def last_call(self) -> CallRecord | None:
+        """Get the record of the last call received, if any."""
+        calls = self.calls
+        return calls[-1] if calls else None
+
+    def record(self, args: tuple[Any], kwargs: dict[Any, Any]) -> None:
+        """Record a call into the next slot of the ring buffer."""
+        index = next(self._counter)
+        record = self.records[index % self.capacity]
+        if self.capture_arguments:
+            record.args = args
+            record.kwargs = kwargs
+        record.index = index
+
+    def wrap(self, func: Callable) -> Callable:
+        """Wrap the original function, to record each call before forwarding it."""
+        record = self.record
+        offset = self.kallable.args_offset
+
+        if self.kallable.is_coroutine:
+
+            async def spied(*args, **kwargs):
+                record(args[offset:] if offset else args, kwargs)
+                return await func(*args, **kwargs)
+
+        else:
+
+            def spied(*args, **kwargs):
+                record(args[offset:] if offset else args, kwargs)
+                return func(*args, **kwargs)
+
+        spied._original_id = self.kallable.id
+        return self.kallable.decoration.add(spied)
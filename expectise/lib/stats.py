@@ -0,0 +1,28 @@
+class MarkerStats:
+    """
+    Statistics of a marker, collected across tests when stats are enabled on the session:
+    * the number of `Expect` statements, and the time spent setting them up,
+    * the number of calls to the mocked function or method,
+    * the time spent checking call arguments, and rendering the diff of mismatching arguments,
+    * the time spent tearing the marker down.
+
+    Durations are in nanoseconds. Counters are not locked: calls received concurrently may be slightly undercounted.
+    """
+
+    __slots__ = ("statements", "calls", "set_up_ns", "argument_check_ns", "diff_ns", "tear_down_ns")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.calls = 0
+        self.set_up_ns = 0
+        self.argument_check_ns = 0
+        self.diff_ns = 0
+        self.tear_down_ns = 0
+
+    @property
+    def total_ns(self) -> int:
+        """Total time spent in Expectise for the marker."""
+        return self.set_up_ns + self.argument_check_ns + self.diff_ns + self.tear_down_ns
+
+    def as_dict(self) -> dict[str, int]:
+        return {**{name: getattr(self, name) for name in self.__slots__}, "total_ns": self.total_ns}
@@ -1,2 +1,5 @@
-from .lifespan import Lifespan
-from .trigger import Trigger
+from ..lazy import lazy_attributes
+
+# Triggers are used by production code, through `mock_if`, and lifespans by the mocking machinery only
+__all__ = ["Lifespan", "Trigger"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"Lifespan": ".lifespan", "Trigger": ".trigger"})
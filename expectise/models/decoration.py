@@ -11,6 +11,8 @@ class Decoration:
     * add back its decoration to a function or method.
     """
 
+    __slots__ = ("is_property", "is_classmethod", "is_staticmethod")
+
     def __init__(self, ref: Callable, klass: Type | None = None):
         self.is_property = isinstance(ref, property)
         self.is_classmethod = isinstance(ref, classmethod)
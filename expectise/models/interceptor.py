@@ -0,0 +1,38 @@
+from typing import Any
+from typing import Type
+
+
+class Interceptor:
+    """
+    Descriptor standing for a mocked method in the namespace of its class, for the whole lifetime of its marker.
+
+    Its target is the object currently standing for the method: placeholder, dispatcher, spy, recorder or original
+    method, with their decoration (classmethod, staticmethod, property). Swapping the target does not mutate the class,
+    which would invalidate the type caches of the interpreter, and slow down attribute lookups on the class down the
+    line.
+    """
+
+    __slots__ = ("target", "_get")
+
+    def __init__(self, target: Any) -> None:
+        self.retarget(target)
+
+    def retarget(self, target: Any) -> None:
+        """Swap the object standing for the method."""
+        self.target = target
+        self._get = target.__get__  # looked up once, rather than on each access to the method
+
+    def __get__(self, instance: Any, owner: Type) -> Any:
+        return self._get(instance, owner)
+
+
+class PropertyInterceptor(Interceptor):
+    """Interceptor standing for a property, that is a data descriptor as well, as properties are."""
+
+    __slots__ = ()
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        self.target.__set__(instance, value)
+
+    def __delete__(self, instance: Any) -> None:
+        self.target.__delete__(instance)
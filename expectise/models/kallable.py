@@ -1,8 +1,13 @@
 from importlib import import_module
+from inspect import iscoroutinefunction
+from sys import intern
+from types import ModuleType
 from typing import Callable
 from typing import Type
 
 from expectise.models.decoration import Decoration
+from expectise.models.interceptor import Interceptor
+from expectise.models.interceptor import PropertyInterceptor
 
 
 class Kallable:
@@ -13,17 +18,46 @@ class Kallable:
     orginal name, owning class or module, decoration, etc.
     """
 
-    def __init__(self, ref: Callable, klass: Type | None = None):
+    __slots__ = (
+        "ref",
+        "decoration",
+        "name",
+        "qualname",
+        "is_bound_method",
+        "args_offset",
+        "is_coroutine",
+        "module_name",
+        "_module",
+        "_klass",
+        "id",
+        "_interceptor",
+    )
+
+    def __init__(self, ref: Callable, klass: Type | None = None, module: ModuleType | None = None):
         self.ref = ref
         self.decoration = Decoration(ref, klass=klass)
         ref_function = self.decoration.strip(ref)
         self.name = ref_function.__name__
         self.qualname = ref_function.__qualname__
         self.is_bound_method = "." in self.qualname  # for direct mock() statements, we can't know the owning class
+        # the instance or class bound to a method is not part of the arguments described by `Expect` statements
+        self.args_offset = 1 if (self.is_bound_method and not self.decoration.is_staticmethod) else 0
+        self.is_coroutine = iscoroutinefunction(ref_function)
         self.module_name = ref_function.__module__
-        self.module = import_module(self.module_name)
+        self._module = module  # imported when first needed, unless given
         self._klass = klass
-        self.id = f"{self.module_name}.{self.qualname}"
+        self.id = intern(f"{self.module_name}.{self.qualname}")  # ids are used as keys of several dictionaries
+        self._interceptor = None  # set in the namespace of the owning class once the method is first replaced
+
+    @property
+    def module(self) -> ModuleType:
+        """
+        Get the module defining the function or method. It is only imported when first needed, as the module may still
+        be partly initialized when the function or method is marked.
+        """
+        if self._module is None:
+            self._module = import_module(self.module_name)
+        return self._module
 
     @property
     def klass(self):
@@ -49,3 +83,23 @@ class Kallable:
             return self.klass
 
         return self.module
+
+    def assign(self, value: Callable) -> None:
+        """
+        Set the object standing for the function or method on its owner: placeholder, dispatcher, original, etc.
+        Methods are replaced once by an interceptor, whose target is swapped afterwards: classes are not mutated by
+        each `Expect` statement and tear down, which would invalidate the type caches of the interpreter.
+        """
+        interceptor = self._interceptor
+        if interceptor is not None and vars(self.owner).get(self.name) is interceptor:
+            interceptor.retarget(value)
+        elif value is self.ref or self.klass is None:
+            setattr(self.owner, self.name, value)  # methods that were never replaced are set back as they are
+        else:
+            self._interceptor = (PropertyInterceptor if self.decoration.is_property else Interceptor)(value)
+            setattr(self.owner, self.name, self._interceptor)
+
+    def restore(self) -> None:
+        """Set the original function or method back on its owner, and drop the interceptor, if any."""
+        self._interceptor = None
+        setattr(self.owner, self.name, self.ref)
@@ -1,23 +1,124 @@
+from abc import ABC
+from abc import abstractmethod
 from os import environ
 
+# This module is imported by production code, through `mock_if`: `typing` is only imported for type checkers
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable
 
-class Trigger:
-    pass
+GENERATION = 0  # bumped to invalidate the cached outcome of all triggers at once
+
+
+def invalidate_triggers() -> None:
+    """
+    Invalidate the cached outcome of all triggers, e.g. once the environment or a configuration file has changed:
+    triggers are evaluated again the next time markers are set up. In tests, `session.invalidate_triggers` also sets
+    all markers up again right away.
+    """
+    global GENERATION
+    GENERATION += 1
+
+
+class Trigger(ABC):
+    """
+    Base class of triggers, deciding whether mock markers are activated.
+
+    Triggers are evaluated once, and their outcome is cached until `invalidate_triggers` or `invalidate` are called:
+    markers are set up on every tear down, and functions marked with `lazy=True` on every call, without evaluating the
+    trigger again.
+    """
+
+    def __init__(self) -> None:
+        self._met = False
+        self._generation = None  # generation of the cached outcome, if any
+
+    @abstractmethod
+    def evaluate(self) -> bool:
+        """Evaluate whether the trigger is met, bypassing the cache."""
+
+    def is_met(self) -> bool:
+        if self._generation != GENERATION:
+            self._met = self.evaluate()
+            self._generation = GENERATION
+        return self._met
+
+    def invalidate(self) -> None:
+        """Invalidate the cached outcome of the trigger."""
+        self._generation = None
 
 
 class EnvTrigger(Trigger):
     """Trigger to activate a mock marker only when the environment variable is set to a specific value."""
 
     def __init__(self, env_key: str, env_val: str):
+        super().__init__()
         self.env_key = env_key
         self.env_val = env_val
 
-    def is_met(self) -> bool:
+    def evaluate(self) -> bool:
         return environ.get(self.env_key, "") == self.env_val
 
 
+class CallableTrigger(Trigger):
+    """Trigger to activate a mock marker only when the given function, called without arguments, returns True."""
+
+    def __init__(self, predicate: "Callable[[], bool]"):
+        super().__init__()
+        self.predicate = predicate
+
+    def evaluate(self) -> bool:
+        return bool(self.predicate())
+
+
+class ConfigTrigger(Trigger):
+    """
+    Trigger to activate a mock marker only when a key of a configuration file is set to a specific value.
+    The file holds `KEY=VALUE` lines, as `.env` files do: blank lines and lines starting with `#` are ignored, and the
+    trigger is not met if the file does not exist.
+    """
+
+    def __init__(self, path: str, key: str, value: str):
+        super().__init__()
+        self.path = path
+        self.key = key
+        self.value = value
+
+    def evaluate(self) -> bool:
+        try:
+            with open(self.path) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return False
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                if key.strip() == self.key:
+                    return value.strip().strip("'\"") == self.value
+        return False
+
+
+class SwitchTrigger(Trigger):
+    """
+    Trigger to activate a mock marker only when the process-wide switch is on. The switch is off by default, and
+    flipped with `session.switch(on)`, which sets all the markers depending on it up in a single batch.
+    """
+
+    on = False  # the process-wide switch, shared by all instances
+
+    def evaluate(self) -> bool:
+        return SwitchTrigger.on
+
+    def is_met(self) -> bool:
+        return SwitchTrigger.on  # read as is, the switch being cheaper to read than the cached outcome
+
+
 class AlwaysTrigger(Trigger):
     """Trigger to activate a mock marker regardless of the environment."""
 
+    def evaluate(self) -> bool:
+        return True
+
     def is_met(self) -> bool:
         return True
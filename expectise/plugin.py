@@ -0,0 +1,157 @@
+"""
+Pytest plugin, registered automatically when Expectise is installed.
+
+It tears down the Expectise session automatically, at the end of each test by default, and provides an `expect`
+fixture. The scope of both can be set to `function`, `module` or `session`, through the `expectise_scope` ini option or
+the `--expectise-scope` command line option.
+
+With pytest-xdist, each worker process holds its own session. Marker counts of each worker can be reported at the end of
+the run with the `--expectise-report` command line option.
+
+Stats of each marker (calls, time spent setting up, checking arguments, rendering diffs and tearing down) can be
+collected and written to a JSON file with the `--expectise-stats` command line option.
+"""
+
+import os
+
+import pytest
+
+from expectise.lib.expect import Expect
+from expectise.lib.session import session as mock_session
+
+SCOPES = ("function", "module", "session")
+STATS_KEY = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("expectise")
+    group.addoption(
+        "--expectise-scope",
+        choices=SCOPES,
+        default=None,
+        help="Scope of the automatic tear down of the Expectise session, and of the `expect` fixture.",
+    )
+    group.addoption(
+        "--expectise-report",
+        action="store_true",
+        default=False,
+        help="Report the number of markers of each worker at the end of the run.",
+    )
+    group.addoption(
+        "--expectise-stats",
+        metavar="PATH",
+        default=None,
+        help="Collect stats of each marker, and write them to a JSON file at the end of the run. "
+        "With pytest-xdist, each worker writes its own file, suffixed with its identifier.",
+    )
+    parser.addini("expectise_scope", default="function", help="Default value of `--expectise-scope`.")
+    parser.addini(
+        "expectise_auto_tear_down",
+        type="bool",
+        default=True,
+        help="Tear down the Expectise session automatically, even for tests that do not use the `expect` fixture.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Check the scope option, and identify the pytest-xdist worker the session is serving, if any."""
+    if (scope := get_scope(config)) not in SCOPES:
+        raise pytest.UsageError(f"Invalid Expectise scope `{scope}`, expecting one of {', '.join(SCOPES)}.")
+    if workerinput := getattr(config, "workerinput", None):
+        mock_session.worker_id = workerinput["workerid"]
+    config.stash[STATS_KEY] = {}
+    if config.getoption("expectise_stats") and not is_controller(config):
+        mock_session.enable_stats()
+
+
+def is_controller(config: pytest.Config) -> bool:
+    """Whether tests are distributed to pytest-xdist workers, by this process."""
+    return bool(getattr(config.option, "numprocesses", None)) and not hasattr(config, "workerinput")
+
+
+def stats_path(config: pytest.Config) -> str:
+    """Path of the JSON file stats are written to, suffixed with the worker identifier under pytest-xdist."""
+    path = config.getoption("expectise_stats")
+    if hasattr(config, "workerinput"):
+        root, extension = os.path.splitext(path)
+        path = f"{root}.{mock_session.worker_id}{extension}"
+    return path
+
+
+def get_scope(config: pytest.Config) -> str:
+    """Get the scope of the automatic tear down and `expect` fixture, favoring the command line over the ini file."""
+    return config.getoption("expectise_scope") or config.getini("expectise_scope")
+
+
+def fixture_scope(fixture_name: str, config: pytest.Config) -> str:
+    """Dynamic scope of the Expectise fixtures."""
+    return get_scope(config)
+
+
+@pytest.fixture(scope=fixture_scope)
+def expectise_session(request: pytest.FixtureRequest):
+    """
+    Tear down the Expectise session at the end of the scope, raising an error if some calls are still expected.
+    If a checkpoint was taken, typically by a module-scoped fixture, the session is restored to it instead.
+    """
+    yield mock_session
+    stats = request.config.stash[STATS_KEY]
+    stats["touched"] = stats.get("touched", 0) + len(mock_session.touched)
+    if mock_session.checkpoints:
+        mock_session.restore(mock_session.checkpoints[-1])
+    else:
+        mock_session.tear_down()
+
+
+@pytest.fixture(autouse=True)
+def expectise_auto_tear_down(request: pytest.FixtureRequest):
+    """Request the session fixture for all tests, unless the automatic tear down is disabled."""
+    if request.config.getini("expectise_auto_tear_down"):
+        request.getfixturevalue("expectise_session")
+    yield
+
+
+@pytest.fixture(scope=fixture_scope)
+def expect(expectise_session):
+    """
+    Fixture returning the `Expect` class, to describe the expected behavior of mocked functions and methods.
+    All expectations are checked, and the session torn down, at the end of the scope of the fixture.
+    """
+    return Expect
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Record the marker counts of the worker, to be collected by the controller process under pytest-xdist."""
+    stats = session.config.stash[STATS_KEY]
+    stats["markers"] = len(mock_session.markers)
+    if mock_session.marker_stats is not None:
+        mock_session.dump_stats(stats_path(session.config))
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["expectise"] = {mock_session.worker_id: stats}
+    elif not stats.get("workers"):
+        # tests were not distributed, so they were all run by the main process
+        stats["workers"] = {mock_session.worker_id: {"markers": stats["markers"], "touched": stats.get("touched", 0)}}
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Stop collecting stats, which were written to their file already."""
+    if config.getoption("expectise_stats"):
+        mock_session.disable_stats()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error) -> None:
+    """Collect the marker counts of a pytest-xdist worker, once it is done."""
+    workers = node.config.stash[STATS_KEY].setdefault("workers", {})
+    workers.update(getattr(node, "workeroutput", {}).get("expectise", {}))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config: pytest.Config) -> None:
+    """Report the marker counts of each worker."""
+    if not config.getoption("expectise_report") or hasattr(config, "workerinput"):
+        return
+    terminalreporter.section("expectise")
+    for worker_id, stats in sorted(config.stash[STATS_KEY].get("workers", {}).items()):
+        terminalreporter.write_line(
+            f"{worker_id}: {stats.get('markers', 0)} markers, {stats.get('touched', 0)} touched during tests"
+        )
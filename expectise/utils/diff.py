@@ -1,49 +1,150 @@
-import difflib
-import textwrap
+import reprlib
+from collections.abc import Mapping
+from collections.abc import Set
 from typing import Any
 
-# Iterable types represented recursively, one element per line
-ITERABLES = {
-    set: {"l": "{", "r": "}"},
-    list: {"l": "[", "r": "]"},
-    dict: {"l": "{", "r": "}"},
-    tuple: {"l": "(", "r": ")"},
-}
 # Diff colors: green for additions, red for deletions, default white
 COLORS = {
     "+": "\033[92m",
     "-": "\033[91m",
     ".": "\033[0m",
 }
+# Bounded representation of the values reported in a diff, whatever their size or depth
+REPR = reprlib.Repr()
+REPR.maxlevel = 3
+REPR.maxstring = 80
+REPR.maxother = 80
+# Kinds of containers walked recursively, other objects being compared as a whole
+MAPPING = "mapping"
+SEQUENCE = "sequence"
+SET = "set"
+# Kinds of containers cached by type, up to a maximum number of types so that dynamically created classes do not leak
+KINDS = {dict: MAPPING, list: SEQUENCE, tuple: SEQUENCE, set: SET, frozenset: SET, str: None, int: None, float: None}
+MAX_KINDS = 1024
+
+
+class Missing:
+    """Placeholder for a dictionary key or sequence element that is present on one side of the diff only."""
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = Missing()
 
 
 class Diff:
+    """
+    Structural diff of two objects, walking both of them together and reporting the paths where they differ, e.g.
+    `['items'][4312]['price']: 10 != 12`.
+
+    The walk is iterative and visits each pair of nested objects at most once, so that it scales linearly with the size
+    of the objects, and handles deeply nested or cyclic objects. Both the number of differences reported and the size
+    of the output are capped.
+    """
+
+    MAX_DIFFERENCES = 20
+    MAX_LENGTH = 10_000
+    MAX_PATH_LENGTH = 200
+
     @staticmethod
-    def repr(obj: Any, indent: int = 0) -> str:
-        """Multiline representation of input object `obj`, recursively processing nested objects."""
-        t = type(obj)
-        if t not in ITERABLES:
-            # Using the default representation of non iterable objects
-            return Diff.indent(obj.__repr__(), indent)
+    def differences(left: Any, right: Any, max_differences: int = MAX_DIFFERENCES) -> list[tuple[str, Any, Any]]:
+        """
+        List the differences between `left` and `right` input objects, as `(path, left value, right value)` tuples.
+        At most `max_differences + 1` differences are listed, so that callers can tell whether some were left out.
+        """
+        differences = []
+        visited = set()
+        # Paths are linked `(parent, key, is_set_element)` nodes, only rendered for the differences reported
+        stack = [(None, left, right)]
+        while stack and len(differences) <= max_differences:
+            path, l, r = stack.pop()
+            if l is r:
+                continue
+
+            kind = Diff.kind(l)
+            if kind is not Diff.kind(r) or (kind is SEQUENCE and type(l) is not type(r)):
+                kind = None
+            if kind is not None:
+                # Nested objects shared or referencing themselves are only compared once
+                if (pair := (id(l), id(r))) in visited:
+                    continue
+                visited.add(pair)
+
+            if kind is MAPPING:
+                children = [((path, k, False), v, w) for k, v in l.items() if (w := r.get(k, MISSING)) is not v]
+                children += [((path, k, False), MISSING, v) for k, v in r.items() if k not in l]
+            elif kind is SEQUENCE:
+                children = [((path, i, False), x, y) for i, (x, y) in enumerate(zip(l, r)) if x is not y]
+                children += [((path, i, False), x, MISSING) for i, x in enumerate(l[len(r) :], len(r))]
+                children += [((path, i, False), MISSING, y) for i, y in enumerate(r[len(l) :], len(l))]
+            elif kind is SET:
+                children = [((path, x, True), x, MISSING) for x in l - r]
+                children += [((path, y, True), MISSING, y) for y in r - l]
+            else:
+                if Diff.differ(l, r):
+                    differences.append((Diff.path(path), l, r))
+                continue
+            stack.extend(reversed(children))
 
-        if t == dict:
-            # "key: value," format for each line
-            content = [f"{Diff.repr(k, indent + 2)}: {Diff.repr(v)}," for k, v in obj.items()]
+        return differences
+
+    @staticmethod
+    def kind(obj: Any) -> str | None:
+        """Get the kind of container of an object, if any, caching the result for each type."""
+        t = type(obj)
+        try:
+            return KINDS[t]
+        except KeyError:
+            pass
+        if isinstance(obj, Mapping):
+            kind = MAPPING
+        elif isinstance(obj, (list, tuple)):
+            kind = SEQUENCE
+        elif isinstance(obj, Set):
+            kind = SET
         else:
-            # "value," format for each line
-            content = [f"{Diff.repr(o, indent + 2)}," for o in obj]
+            kind = None
+        if len(KINDS) < MAX_KINDS:
+            KINDS[t] = kind
+        return kind
 
-        return "\n".join([Diff.indent(ITERABLES[t]["l"], indent)] + content + [Diff.indent(ITERABLES[t]["r"], indent)])
+    @staticmethod
+    def differ(left: Any, right: Any) -> bool:
+        """Compare non iterable objects, considering objects that cannot be compared as different unless identical."""
+        try:
+            return bool(left != right)
+        except Exception:
+            return left is not right
 
     @staticmethod
-    def indent(s: str, k: int) -> str:
-        """Indents the input string `s` with `k` spaces."""
-        return textwrap.indent(s, " " * k)
+    def path(node: tuple | None, max_length: int = MAX_PATH_LENGTH) -> str:
+        """Render a linked path node as a string, keeping its end only if it is too long."""
+        keys = []
+        length = 0
+        while node is not None and length <= max_length:
+            node, key, is_set_element = node
+            keys.append(f"{{{REPR.repr(key)}}}" if is_set_element else f"[{REPR.repr(key)}]")
+            length += len(keys[-1])
+        path = "".join(reversed(keys))
+        return f"...{path[-max_length:]}" if node is not None or length > max_length else path
 
     @staticmethod
-    def print(left: Any, right: Any) -> str:
-        """Build a git-style text diff of `left` and `right` input objects."""
-        lines_diff = difflib.ndiff(Diff.repr(left).split("\n"), Diff.repr(right).split("\n"))
-        return "\n".join(
-            [COLORS.get(line[0], COLORS["."]) + line + COLORS["."] for line in lines_diff if not line.startswith("?")]
-        )
+    def print(left: Any, right: Any, max_differences: int = MAX_DIFFERENCES, max_length: int = MAX_LENGTH) -> str:
+        """Build a text diff of `left` and `right` input objects, one line per difference."""
+        differences = Diff.differences(left, right, max_differences=max_differences)
+        lines = []
+        length = 0
+        for path, l, r in differences[:max_differences]:
+            line = f"{COLORS['-']}{REPR.repr(l)}{COLORS['.']} != {COLORS['+']}{REPR.repr(r)}{COLORS['.']}"
+            line = f"{path}: {line}" if path else line
+            length += len(line) + 1
+            if length > max_length:
+                lines.append("... (output truncated)")
+                break
+            lines.append(line)
+        else:
+            if len(differences) > max_differences:
+                lines.append(f"... (only the first {max_differences} differences are shown)")
+
+        return "\n".join(lines)